@@ -0,0 +1,77 @@
+"""
+Бенчмарк публикации: один канал RabbitBroker vs PooledPublisher.
+
+Вместо RabbitMQ используется stand-in канала: каждый канал обрабатывает
+кадры последовательно (``--channel-cost`` на сообщение, как процесс
+канала в брокере), а publisher confirm приходит через ``--rtt`` секунд
+после обработки кадра. Время канала моделируется виртуальными часами,
+поэтому заглушка не тратит CPU клиента.
+
+Запуск::
+
+    PYTHONPATH=. python benchmarks/publish_pool.py --messages 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from tigro.transport.pool import PooledPublisher
+
+
+class StandInChannel:
+    """Канал-заглушка: последовательная обработка кадров + RTT на confirm."""
+
+    def __init__(self, channel_cost: float, rtt: float) -> None:
+        self._channel_cost = channel_cost
+        self._rtt = rtt
+        self._free_at = 0.0
+
+    async def publish(self, message: Any, routing_key: str, priority: Any = None) -> None:
+        # Кадры одного канала обрабатываются брокером по очереди
+        now = time.perf_counter()
+        start = max(now, self._free_at)
+        self._free_at = start + self._channel_cost
+        await asyncio.sleep(self._free_at - now + self._rtt)
+
+
+async def _run(publish: Callable[[Any, str], Awaitable[Any]], messages: int, concurrency: int) -> float:
+    per_worker = messages // concurrency
+
+    async def producer() -> None:
+        for i in range(per_worker):
+            await publish({"n": i}, "event.user.input")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(producer() for _ in range(concurrency)))
+    return per_worker * concurrency / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--rtt", type=float, default=0.001)
+    parser.add_argument("--channel-cost", type=float, default=0.0001)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 128, 512])
+    args = parser.parse_args()
+
+    print(f"{'concurrency':>11} | {'single channel':>15} | {'pool x' + str(args.pool_size):>15} | speedup")
+    for concurrency in args.concurrency:
+        single = StandInChannel(args.channel_cost, args.rtt)
+        base = await _run(single.publish, args.messages, concurrency)
+
+        async def factory() -> StandInChannel:
+            return StandInChannel(args.channel_cost, args.rtt)
+
+        pool = PooledPublisher(factory, size=args.pool_size)
+        await pool.start()
+        pooled = await _run(pool.publish, args.messages, concurrency)
+        await pool.close()
+        print(f"{concurrency:>11} | {base:>11.0f} m/s | {pooled:>11.0f} m/s | x{pooled / base:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,23 +1,10 @@
 # shared/schemas.py
-"""Pydantic-схемы событий и ответов Telegram."""
+"""Pydantic-схемы событий и ответов Telegram.
 
-from pydantic import BaseModel
-from typing import Optional, Literal, Dict, Any
+Переиспользуем схемы из ``tigro.schemas``, чтобы примеры и тесты
+не расходились с библиотекой (например, по ``correlation_id``).
+"""
 
-class TgEvent(BaseModel):
-    user_id: int
-    chat_id: int
-    message_id: Optional[int]
-    text: Optional[str]
-    callback_data: Optional[str]
-    state: Optional[str]
-    event_type: Literal["message", "callback", "command"]
-    metadata: Optional[Dict[str, Any]] = {}
+from tigro.schemas import TgEvent, TgResponse
 
-class TgResponse(BaseModel):
-    action: Literal["send_message", "edit_message", "answer_callback", "none"]
-    text: Optional[str] = None
-    next_state: Optional[str] = None
-    markup: Optional[Dict[str, Any]] = None
-    metadata: Optional[Dict[str, Any]] = None
-    error: Optional[str] = None
+__all__ = ["TgEvent", "TgResponse"]
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from tigro.core import Context, Router
+from tigro.matchers import Predicate
+from tigro.schemas import TgEvent, TgResponse
+from tigro.transport.subscriber import AdaptiveSubscriber
+
+
+class DummyPublisher:
+    def __init__(self) -> None:
+        self.sent: list[TgResponse] = []
+
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        self.sent.append(resp)
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.acks: list[tuple[int, bool]] = []
+        self.rejects: list[int] = []
+
+
+class FakeMessage:
+    def __init__(self, channel: FakeChannel, tag: int, body: bytes) -> None:
+        self.channel = channel
+        self.delivery_tag = tag
+        self.body = body
+
+    async def ack(self, multiple: bool = False) -> None:
+        self.channel.acks.append((self.delivery_tag, multiple))
+
+    async def reject(self, requeue: bool = False) -> None:
+        self.channel.rejects.append(self.delivery_tag)
+
+
+def _body(chat_id: int, text: str) -> bytes:
+    return TgEvent(user_id=chat_id, chat_id=chat_id, text=text, event_type="message").model_dump_json().encode()
+
+
+@pytest.mark.asyncio
+async def test_batch_keeps_chat_order_and_acks_once() -> None:
+    pub = DummyPublisher()
+    router = Router(publisher=pub)
+    order: list[tuple[int, str]] = []
+
+    async def handle(ctx: Context) -> None:
+        if ctx.event.text == "boom":
+            raise RuntimeError("boom")
+        # первое событие чата 1 медленное – второе всё равно идёт после него
+        await asyncio.sleep(0.02 if ctx.event.text == "a1" else 0)
+        order.append((ctx.event.chat_id, ctx.event.text or ""))
+
+    router.register(Predicate(lambda ev: True), handle)
+    channel = FakeChannel()
+    subscriber = AdaptiveSubscriber(router, batch_size=5, batch_timeout=10)
+    bodies = [_body(1, "a1"), _body(2, "b1"), _body(1, "a2"), b"{not json", _body(2, "boom")]
+    for tag, body in enumerate(bodies, start=1):
+        await subscriber._on_message(FakeMessage(channel, tag, body), lane="event.user.input")
+    await subscriber._scheduler.join(timeout=1)
+
+    assert [text for chat, text in order if chat == 1] == ["a1", "a2"]
+    assert order.index((2, "b1")) < order.index((1, "a1"))  # чаты не ждут друг друга
+    assert sorted(channel.rejects) == [4, 5]
+    assert channel.acks == [(3, True)]
+    assert subscriber.metrics()["batches"] == 1
+
+
+async def _two_batches(first_chat: int, second_chat: int) -> tuple[list[str], FakeChannel]:
+    router = Router(publisher=DummyPublisher())
+    order: list[str] = []
+
+    async def handle(ctx: Context) -> None:
+        await asyncio.sleep(0.03 if ctx.event.text == "first" else 0)
+        order.append(ctx.event.text or "")
+
+    router.register(Predicate(lambda ev: True), handle)
+    channel = FakeChannel()
+    subscriber = AdaptiveSubscriber(router, batch_size=10, batch_timeout=0.005)
+    await subscriber._on_message(FakeMessage(channel, 1, _body(first_chat, "first")), lane="event.user.input")
+    await asyncio.sleep(0.01)  # первый пакет ушёл по таймауту
+    await subscriber._on_message(FakeMessage(channel, 2, _body(second_chat, "second")), lane="event.user.input")
+    await asyncio.sleep(0.01)
+    await subscriber._scheduler.join(timeout=1)
+    assert subscriber.metrics()["batches"] == 2
+    return order, channel
+
+
+@pytest.mark.asyncio
+async def test_chat_order_spans_batches() -> None:
+    order, channel = await _two_batches(1, 1)
+    assert order == ["first", "second"]
+    assert channel.acks == [(1, True), (2, True)]
+
+
+@pytest.mark.asyncio
+async def test_ack_waits_for_earlier_batch() -> None:
+    order, channel = await _two_batches(1, 2)
+    assert order == ["second", "first"]
+    # второй пакет завершился раньше, но подтверждён вместе с первым
+    assert channel.acks == [(2, True)]
+
+
+@pytest.mark.asyncio
+async def test_body_with_two_events_is_decoded_per_message() -> None:
+    router = Router(publisher=DummyPublisher())
+    seen: list[str] = []
+
+    async def handle(ctx: Context) -> None:
+        seen.append(ctx.event.text or "")
+
+    router.register(Predicate(lambda ev: True), handle)
+    channel = FakeChannel()
+    subscriber = AdaptiveSubscriber(router, batch_size=3, batch_timeout=10)
+    bodies = [_body(1, "a"), _body(2, "x") + b"," + _body(2, "y"), _body(3, "c")]
+    for tag, body in enumerate(bodies, start=1):
+        await subscriber._on_message(FakeMessage(channel, tag, body), lane="event.user.input")
+    await subscriber._scheduler.join(timeout=1)
+
+    assert sorted(seen) == ["a", "c"]
+    assert channel.rejects == [2]
+    assert channel.acks == [(3, True)]
+
+
+@pytest.mark.asyncio
+async def test_tuner_sees_per_event_latency_and_slots_are_batches() -> None:
+    router = Router(publisher=DummyPublisher())
+
+    async def handle(ctx: Context) -> None:
+        await asyncio.sleep(0.01)
+
+    router.register(Predicate(lambda ev: True), handle)
+    subscriber = AdaptiveSubscriber(
+        router,
+        batch_size=4,
+        batch_timeout=10,
+        lanes={"event.user.input": 8, "event.user.input.bulk": 1},
+    )
+    assert subscriber._scheduler.max_concurrency == 4  # 16 сообщений / 4 в пакете
+    channel = FakeChannel()
+    for tag in range(1, 5):
+        await subscriber._on_message(FakeMessage(channel, tag, _body(1, "x")), lane="event.user.input")
+    await subscriber._scheduler.join(timeout=1)
+
+    # четыре события одного чата шли подряд (~40 мс), но каждое заняло ~10 мс
+    assert subscriber.tuner.metrics()["latency_short"] < 0.03
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from tigro.gateway.breaker import CircuitBreakers, CircuitOpenError
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers_via_half_open() -> None:
+    now = [0.0]
+    breakers = CircuitBreakers(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    calls = 0
+
+    async def timeout() -> None:
+        nonlocal calls
+        calls += 1
+        raise asyncio.TimeoutError
+
+    async def ok() -> str:
+        nonlocal calls
+        calls += 1
+        return "ok"
+
+    for _ in range(2):
+        with pytest.raises(asyncio.TimeoutError):
+            await breakers.call("svc", timeout)
+    assert breakers.is_open("svc")
+    with pytest.raises(CircuitOpenError):
+        await breakers.call("svc", ok)
+    assert calls == 2  # fallback без вызова сервиса
+
+    now[0] = 10  # half-open: проба падает – снова open
+    assert not breakers.is_open("svc")
+    with pytest.raises(asyncio.TimeoutError):
+        await breakers.call("svc", timeout)
+    assert breakers.snapshot()["svc"]["state"] == "open"
+
+    now[0] = 20  # успешная проба замыкает цепь
+    assert await breakers.call("svc", ok) == "ok"
+    snap = breakers.snapshot()["svc"]
+    assert snap["state"] == "closed" and snap["opened"] == 2 and snap["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_breakers_are_independent_per_key() -> None:
+    breakers = CircuitBreakers(failure_threshold=1)
+
+    async def boom() -> None:
+        raise RuntimeError("down")
+
+    async def ok() -> int:
+        return 1
+
+    with pytest.raises(RuntimeError):
+        await breakers.call("reports", boom)
+    assert breakers.is_open("reports")
+    assert await breakers.call("start", ok) == 1
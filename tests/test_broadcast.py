@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from tigro.core import Router
+from tigro.gateway.broadcast import BroadcastConsumer, BroadcastStore
+from tigro.schemas import BroadcastFrame, TgResponse
+
+
+class BroadcastPublisher:
+    def __init__(self) -> None:
+        self.frames: list[BroadcastFrame] = []
+
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        return None
+
+    async def publish_broadcast(self, frame: BroadcastFrame) -> None:
+        self.frames.append(frame)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_is_chunked_and_resumable(tmp_path) -> None:
+    pub = BroadcastPublisher()
+    router = Router(publisher=pub)
+    bid = await router.broadcast(range(5), "news", broadcast_id="b1")
+    # payload один раз, получатели — отдельными chunk-ами
+    assert bid == "b1"
+    assert [f.kind for f in pub.frames] == ["start"] + ["chunk"] + ["end"]
+
+    sent: list[int] = []
+
+    stuck = asyncio.Event()
+
+    async def send(chat_id: int, resp: TgResponse) -> None:
+        if chat_id == 3 and not stuck.is_set():
+            stuck.set()
+            await asyncio.sleep(10)  # gateway «падает» посреди chunk-а
+        sent.append(chat_id)
+
+    store = BroadcastStore(str(tmp_path))
+    consumer = BroadcastConsumer(send, store, window=1)
+    await consumer.handle(pub.frames[0])
+    task = asyncio.ensure_future(consumer.handle(pub.frames[1]))
+    await stuck.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # повторная доставка того же chunk-а продолжает со смещения
+    await consumer.handle(pub.frames[1])
+    await consumer.handle(pub.frames[1])
+    await consumer.handle(pub.frames[2])
+    assert sent == [0, 1, 2, 3, 4]
+    assert store.load("b1")["done"] == [0]
+
+
+@pytest.mark.asyncio
+async def test_chunk_is_sent_by_replica_that_missed_start(tmp_path) -> None:
+    pub = BroadcastPublisher()
+    await Router(publisher=pub).broadcast([1, 2, 3], "news", broadcast_id="b2")
+    start, chunk, end = pub.frames
+    assert chunk.payload is not None and chunk.payload.text == "news"
+
+    sent: list[int] = []
+
+    async def send(chat_id: int, resp: TgResponse) -> None:
+        sent.append(chat_id)
+
+    # start обработала другая реплика gateway со своим хранилищем
+    replica = BroadcastConsumer(send, BroadcastStore(str(tmp_path / "replica-b")))
+    await replica.handle(chunk)
+    await replica.handle(end)
+    assert sent == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_chunk_without_payload_is_dropped(tmp_path) -> None:
+    sent: list[int] = []
+
+    async def send(chat_id: int, resp: TgResponse) -> None:
+        sent.append(chat_id)
+
+    consumer = BroadcastConsumer(send, BroadcastStore(str(tmp_path)))
+    frame = BroadcastFrame(broadcast_id="lost", kind="chunk", seq=0, chat_ids=[1, 2])
+    assert await consumer.handle(frame) is None  # без исключения – нет бесконечной переотправки
+    assert sent == []
@@ -0,0 +1,86 @@
+import pytest
+
+from tigro.core import Context, Router
+from tigro.keyboard import CallbackData, CallbackDataExpired, MemoryCallbackStore, cb_btn
+from tigro.schemas import TgEvent, TgResponse
+
+
+class DummyPublisher:
+    def __init__(self) -> None:
+        self.sent: list[TgResponse] = []
+
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        self.sent.append(resp)
+
+
+@pytest.mark.parametrize("codec", ["text", "struct"])
+def test_roundtrip_typed_fields(codec: str) -> None:
+    Item = CallbackData("item", codec=codec, id=int, price=float, name=str, sale=bool)
+    value = Item(id=-42, price=9.5, name="a:b%c", sale=True)
+    data = cb_btn("Купить", value)["callback_data"]
+    assert len(data.encode()) <= 64
+    assert dict(Item.unpack(data)) == {"id": -42, "price": 9.5, "name": "a:b%c", "sale": True}
+
+
+def test_long_payload_spills_into_store() -> None:
+    now = [0.0]
+    store = MemoryCallbackStore(ttl=10, clock=lambda: now[0])
+    Note = CallbackData("note", store=store, text=str)
+    data = Note.pack(text="x" * 200)
+    assert data.startswith("note/") and len(store) == 1
+    assert Note.unpack(data).text == "x" * 200
+
+    # уже разобранный ключ не переживает истечение записи в хранилище
+    now[0] = 11
+    with pytest.raises(CallbackDataExpired):
+        Note.unpack(data)
+
+
+def test_malformed_data_is_reported_with_callback_data() -> None:
+    Order = CallbackData("order", id=int)
+    with pytest.raises(ValueError, match="order:x"):
+        Order.unpack("order:x")
+    with pytest.raises(ValueError, match="does not belong"):
+        Order.unpack("other:1")
+
+
+@pytest.mark.asyncio
+async def test_filter_matches_and_passes_decoded_fields() -> None:
+    Order = CallbackData("order", id=int, action=str)
+    pub = DummyPublisher()
+    router = Router(publisher=pub)
+
+    async def buy(ctx: Context) -> None:
+        await ctx.send_message(f"buy {ctx.match['id'] + 1}")
+
+    router.register(Order.filter(action="buy"), buy)
+    for data in (Order.pack(id=7, action="buy"), Order.pack(id=7, action="sell"), "order:broken"):
+        await router.dispatch(TgEvent(user_id=1, chat_id=1, callback_data=data, event_type="callback"))
+    assert [r.text for r in pub.sent] == ["buy 8", "Команда не распознана.", "Команда не распознана."]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_unpacks_callback_data_once(capsys, monkeypatch) -> None:
+    Order = CallbackData("order", id=int)
+    pub = DummyPublisher()
+    router = Router(publisher=pub)
+    calls: list[str] = []
+    unpack = CallbackData.unpack
+
+    def counting_unpack(self: CallbackData, data: str) -> dict:
+        calls.append(data)
+        return unpack(self, data)
+
+    monkeypatch.setattr(CallbackData, "unpack", counting_unpack)
+
+    async def show(ctx: Context) -> None:
+        await ctx.send_message(str(ctx.match["id"]))
+
+    router.register(Order.filter(), show)
+    for data in (Order.pack(id=3), "order:broken"):
+        await router.dispatch(TgEvent(user_id=1, chat_id=1, callback_data=data, event_type="callback"))
+
+    # match() + captures() разбирали бы данные и печатали предупреждение дважды
+    assert calls == [Order.pack(id=3), "order:broken"]
+    assert capsys.readouterr().out.count("[⚠️ CallbackData]") == 1
+    assert [r.text for r in pub.sent] == ["3", "Команда не распознана."]
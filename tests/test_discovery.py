@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from tigro.core import Router
+from tigro.discovery import autodiscover_package
+from tigro.schemas import TgEvent, TgResponse
+
+
+class DummyPublisher:
+    def __init__(self) -> None:
+        self.sent: list[TgResponse] = []
+
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        self.sent.append(resp)
+
+
+def _make_package(root: Path) -> None:
+    pkg = root / "svc_handlers"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "start.py").write_text(
+        textwrap.dedent(
+            """
+            from tigro.decorators import command
+
+            @command("/start")
+            async def start(ctx):
+                await ctx.send_message("hi")
+            """
+        )
+    )
+
+
+def _forget_package() -> None:
+    for name in [m for m in sys.modules if m.startswith("svc_handlers")]:
+        del sys.modules[name]
+
+
+@pytest.mark.asyncio
+async def test_autodiscover_package_uses_manifest(tmp_path: Path, monkeypatch) -> None:
+    _make_package(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    manifest = tmp_path / "routes.json"
+
+    assert autodiscover_package(Router(publisher=DummyPublisher()), "svc_handlers", manifest=manifest) == 1
+    assert manifest.exists()
+    _forget_package()
+
+    pub = DummyPublisher()
+    router = Router(publisher=pub)
+    assert autodiscover_package(router, "svc_handlers", manifest=manifest) == 1
+    assert "svc_handlers.start" not in sys.modules
+
+    event = TgEvent(user_id=1, chat_id=1, text="/start", event_type="message")
+    await router.dispatch(event)
+    assert "svc_handlers.start" in sys.modules
+    assert pub.sent[0].text == "hi"
+    _forget_package()
+
+
+def test_touched_module_is_rescanned_and_manifest_rewritten(tmp_path: Path, monkeypatch) -> None:
+    _make_package(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    manifest = tmp_path / "routes.json"
+    autodiscover_package(Router(publisher=DummyPublisher()), "svc_handlers", manifest=manifest)
+    _forget_package()
+
+    module = tmp_path / "svc_handlers" / "start.py"
+    module.write_text(module.read_text() + '\n@command("/help")\nasync def help(ctx):\n    pass\n')
+    stat = module.stat()
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert autodiscover_package(Router(publisher=DummyPublisher()), "svc_handlers", manifest=manifest) == 2
+    assert "svc_handlers.start" in sys.modules  # модуль изменён – импортирован заново
+    entry = json.loads(manifest.read_text())["modules"]["svc_handlers.start"]
+    assert entry["mtime"] == module.stat().st_mtime_ns
+    assert [h["qualname"] for h in entry["handlers"]] == ["start", "help"]
+    _forget_package()
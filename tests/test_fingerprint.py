@@ -0,0 +1,58 @@
+import pytest
+
+from tigro.gateway.fingerprint import RenderCache
+
+
+class TelegramBadRequest(Exception):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_identical_edit_is_suppressed() -> None:
+    cache = RenderCache()
+    calls: list[str] = []
+
+    async def edit() -> str:
+        calls.append("edit")
+        return "ok"
+
+    key = (1, 100, 5)
+    markup = {"inline_keyboard": [[{"text": "▶️", "callback_data": "next"}]]}
+    same = RenderCache.fingerprint("Страница 2", "HTML", markup)
+    assert same == RenderCache.fingerprint("Страница 2", "HTML", dict(markup))
+
+    assert await cache.edit(key, same, edit) == "ok"
+    assert await cache.edit(key, same, edit) is None
+    assert await cache.edit(key, RenderCache.fingerprint("Страница 2", "", markup), edit) == "ok"
+    assert calls == ["edit", "edit"]
+    assert cache.stats == {"edits": 2, "suppressed": 1, "not_modified": 0, "cached": 1}
+
+
+@pytest.mark.asyncio
+async def test_not_modified_error_is_swallowed_and_remembered() -> None:
+    cache = RenderCache()
+    key = (1, 100, 5)
+    fp = RenderCache.fingerprint("текст", None, None)
+
+    async def not_modified() -> None:
+        raise TelegramBadRequest("Telegram server says - Bad Request: message is not modified")
+
+    async def broken() -> None:
+        raise TelegramBadRequest("Bad Request: message to edit not found")
+
+    assert await cache.edit(key, fp, not_modified) is None
+    assert cache.skip(key, fp)
+
+    other = RenderCache.fingerprint("другой", None, None)
+    with pytest.raises(TelegramBadRequest):
+        await cache.edit(key, other, broken)
+    assert not cache.skip(key, fp)  # после неизвестной ошибки отпечаток забыт
+    assert cache.stats["not_modified"] == 1
+
+
+def test_cache_is_bounded() -> None:
+    cache = RenderCache(max_items=2)
+    fp = RenderCache.fingerprint("x", None, None)
+    for message_id in range(3):
+        cache.remember((1, 1, message_id), fp)
+    assert len(cache) == 2 and not cache.skip((1, 1, 0), fp)
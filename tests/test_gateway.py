@@ -0,0 +1,192 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from tigro.gateway import AiogramGateway, CircuitBreakers
+from tigro.schemas import MediaRef, TgEvent, TgResponse
+
+TOKEN_A = "123456:AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"
+TOKEN_B = "654321:BBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBB"
+
+
+class FakeState:
+    async def get_state(self) -> None:
+        return None
+
+
+class FakeMessage:
+    def __init__(self, calls: list, chat_id: int = 100, message_id: int = 5, text: str = "") -> None:
+        self.calls = calls
+        self.chat = SimpleNamespace(id=chat_id)
+        self.from_user = SimpleNamespace(id=chat_id)
+        self.message_id = message_id
+        self.text = text
+
+    async def answer(self, text: str, **kwargs: Any) -> Any:
+        self.calls.append(("message", text))
+        return SimpleNamespace(message_id=self.message_id + 1)
+
+    async def edit_text(self, text: str, **kwargs: Any) -> None:
+        self.calls.append(("edit", text))
+
+
+class FakeCallback:
+    def __init__(self, data: str = "go") -> None:
+        self.calls: list = []
+        self.data = data
+        self.from_user = SimpleNamespace(id=100)
+        self.message = FakeMessage(self.calls)
+
+    async def answer(self, text: str = "", show_alert: bool = False) -> None:
+        self.calls.append(("answer", text, show_alert))
+
+
+def _gateway(reply: Any, delay: float = 0.0, grace: float = 0.05, tokens: Any = TOKEN_A) -> AiogramGateway:
+    gateway = AiogramGateway(tokens, callback_ack_grace=grace)
+    gateway.events = []  # type: ignore[attr-defined]
+
+    async def call_service(event: TgEvent) -> TgResponse:
+        gateway.events.append(event)  # type: ignore[attr-defined]
+        await asyncio.sleep(delay)
+        if isinstance(reply, BaseException):
+            raise reply
+        return reply.model_copy()
+
+    gateway._call_service = call_service  # type: ignore[method-assign]
+    return gateway
+
+
+async def _click(gateway: AiogramGateway, cq: FakeCallback) -> None:
+    bot = next(iter(gateway.bots.values()))
+    await gateway._on_callback(cq, FakeState(), bot)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_default_acks_at_once_in_parallel_with_rpc() -> None:
+    cq = FakeCallback()
+    gateway = _gateway(TgResponse(action="edit_message", text="Страница 2"), delay=0.1, grace=0.0)
+    assert AiogramGateway(TOKEN_A)._callback_ack_grace == 0
+    task = asyncio.ensure_future(_click(gateway, cq))
+    await asyncio.sleep(0.02)
+    assert cq.calls == [("answer", "", False)]  # спиннер погас до ответа сервиса
+    await task
+    assert cq.calls == [("answer", "", False), ("edit", "Страница 2")]
+
+
+@pytest.mark.asyncio
+async def test_fast_reply_is_shown_as_toast() -> None:
+    cq = FakeCallback()
+    gateway = _gateway(TgResponse(action="answer_callback", text="Готово", metadata={"show_alert": True}))
+    await _click(gateway, cq)
+    assert cq.calls == [("answer", "Готово", True)]
+
+
+@pytest.mark.asyncio
+async def test_late_toast_is_dropped_not_sent_as_message() -> None:
+    cq = FakeCallback()
+    gateway = _gateway(TgResponse(action="answer_callback", text="Готово"), delay=0.1, grace=0.01)
+    await _click(gateway, cq)
+    assert cq.calls == [("answer", "", False)]
+
+    late = TgResponse(action="answer_callback", text="Готово")
+    assert await gateway._deliver_late(TgEvent(user_id=1, chat_id=1, event_type="callback"), late) is None
+
+
+@pytest.mark.asyncio
+async def test_slow_edit_is_acked_then_applied() -> None:
+    cq = FakeCallback()
+    gateway = _gateway(TgResponse(action="edit_message", text="Страница 2"), delay=0.1, grace=0.01)
+    await _click(gateway, cq)
+    assert cq.calls == [("answer", "", False), ("edit", "Страница 2")]
+
+
+@pytest.mark.asyncio
+async def test_timeout_alert_within_grace_and_message_after_ack() -> None:
+    cq = FakeCallback()
+    await _click(_gateway(asyncio.TimeoutError()), cq)
+    assert cq.calls == [("answer", "⚠️ Сервис не ответил", True)]
+
+    cq = FakeCallback()
+    await _click(_gateway(asyncio.TimeoutError(), delay=0.1, grace=0.01), cq)
+    assert cq.calls == [("answer", "", False), ("message", "⚠️ Сервис не ответил")]
+
+
+@pytest.mark.asyncio
+async def test_two_bots_route_by_bot_id() -> None:
+    gateway = _gateway(TgResponse(action="send_message", text="Привет"), tokens=[TOKEN_A, TOKEN_B])
+    bot_a, bot_b = gateway.bots[123456], gateway.bots[654321]
+
+    calls: list = []
+    message = FakeMessage(calls, text="/start")
+    await gateway._on_message(message, FakeState(), bot_b)  # type: ignore[arg-type]
+    assert gateway.events[0].bot_id == bot_b.id  # type: ignore[attr-defined]
+    assert calls == [("message", "Привет")]
+    assert gateway.schedulers[bot_b.id].stats["submitted"] == 1
+    assert gateway.schedulers[bot_a.id].stats["submitted"] == 0
+
+    # ответ без bot_id / с чужим id уходит от бота по умолчанию
+    assert gateway._bot_for(None) is bot_a and gateway._bot_for(42) is bot_a
+
+    sent: list = []
+
+    async def send_message(chat_id: int, text: str, **kwargs: Any) -> None:
+        sent.append((chat_id, text))
+
+    object.__setattr__(bot_b, "send_message", send_message)
+    await gateway._send_broadcast(7, TgResponse(action="send_message", text="Рассылка", bot_id=bot_b.id))
+    assert sent == [(7, "Рассылка")]
+    assert gateway.schedulers[bot_b.id].stats["submitted"] == 2
+
+    # file_id уникальны для бота – ключи кэша медиа разделены
+    ref = MediaRef(type="photo", key="banner")
+    assert gateway._media[bot_a.id].cache_key(ref) != gateway._media[bot_b.id].cache_key(ref)
+
+
+def test_gateway_routes_lanes_with_custom_classifier() -> None:
+    def classify(event: TgEvent) -> str:
+        return "bulk" if (event.text or "").startswith("/export") else "interactive"
+
+    gateway = AiogramGateway(TOKEN_A, lanes={"bulk": "event.user.input.bulk"}, classify=classify)
+    export = TgEvent(user_id=1, chat_id=1, text="/export all", event_type="message")
+    click = TgEvent(user_id=1, chat_id=1, callback_data="go", event_type="callback")
+    assert gateway._rpc.route_for(export) == "event.user.input.bulk"
+    assert gateway._rpc.route_for(click) == "event.user.input"
+
+
+@pytest.mark.asyncio
+async def test_handler_does_not_wait_for_stalled_send() -> None:
+    gateway = _gateway(TgResponse(action="send_message", text="Привет"))
+    gateway._send_wait = 0.05
+    calls: list = []
+    message = FakeMessage(calls, text="/start")
+    answer = message.answer
+
+    async def flooded(text: str, **kwargs: Any) -> Any:
+        await asyncio.sleep(0.2)  # планировщик ждёт retry_after
+        return await answer(text, **kwargs)
+
+    message.answer = flooded  # type: ignore[method-assign]
+    await asyncio.wait_for(gateway._on_message(message, FakeState(), gateway.bots[123456]), 0.15)  # type: ignore[arg-type]
+    assert calls == []
+    await gateway.scheduler.close()
+    assert calls == [("message", "Привет")]
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fallback_goes_through_scheduler() -> None:
+    breakers = CircuitBreakers(failure_threshold=1)
+    gateway = AiogramGateway(TOKEN_A, breakers=breakers)
+    click = TgEvent(user_id=1, chat_id=1, callback_data="go", event_type="callback")
+
+    # ключ по умолчанию – очередь полосы, событие при этом не меняется
+    assert gateway._breaker_key(click) == "event.user.input"
+    assert click.priority is None
+
+    breakers.get("event.user.input").record_failure()
+    cq = FakeCallback()
+    await _click(gateway, cq)
+    bot = next(iter(gateway.bots.values()))
+    assert cq.calls == [("answer", breakers.fallback_text, False)]
+    assert gateway.schedulers[bot.id].stats["sent"] == 1
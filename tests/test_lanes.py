@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from tigro.gateway.rpc import RpcClient
+from tigro.schemas import TgEvent
+from tigro.transport.lanes import LaneScheduler
+
+
+@pytest.mark.asyncio
+async def test_weighted_round_robin_prefers_interactive_lane() -> None:
+    scheduler = LaneScheduler({"interactive": 3, "bulk": 1}, max_concurrency=1, reserve=0)
+    order = []
+
+    def job(name: str):
+        async def run() -> None:
+            order.append(name)
+            await asyncio.sleep(0)
+
+        return run
+
+    gate = asyncio.Event()
+
+    async def blocker() -> None:
+        await gate.wait()
+
+    scheduler.submit("bulk", blocker)
+    for _ in range(4):
+        scheduler.submit("bulk", job("bulk"))
+        scheduler.submit("interactive", job("interactive"))
+    gate.set()
+    await scheduler.join(timeout=1)
+
+    assert order[:4].count("interactive") == 3
+    assert len(order) == 8
+
+
+@pytest.mark.asyncio
+async def test_reserved_slots_stay_free_for_primary_lane() -> None:
+    scheduler = LaneScheduler({"interactive": 8, "bulk": 1}, max_concurrency=3, reserve=1)
+    gate = asyncio.Event()
+
+    async def slow() -> None:
+        await gate.wait()
+
+    for _ in range(5):
+        scheduler.submit("bulk", slow)
+    assert scheduler.stats()["bulk"]["running"] == 2
+
+    started = asyncio.Event()
+
+    async def click() -> None:
+        started.set()
+
+    scheduler.submit("interactive", click)
+    await asyncio.wait_for(started.wait(), 1)
+    gate.set()
+    await scheduler.join(timeout=1)
+    assert scheduler.stats()["bulk"]["started"] == 5
+
+
+def test_bulk_lane_shares_default_queue_unless_configured() -> None:
+    bulk = TgEvent(user_id=1, chat_id=1, text="x", event_type="message", priority="bulk")
+    assert RpcClient().route_for(bulk) == "event.user.input"
+
+    client = RpcClient(lanes={"bulk": "event.user.input.bulk"})
+    assert client.route_for(bulk) == "event.user.input.bulk"
+    click = TgEvent(user_id=1, chat_id=1, callback_data="x", event_type="callback")
+    assert client.route_for(click) == "event.user.input" and click.priority == "interactive"
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from tigro.decorators import regex
+from tigro.modules import ModuleRouter, include_router
+from tigro.core import Router, Context
+from tigro.schemas import TgEvent, TgResponse
+
+
+class DummyPublisher:
+    def __init__(self) -> None:
+        self.sent: list[TgResponse] = []
+
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        self.sent.append(resp)
+
+
+def _event(text: str) -> TgEvent:
+    return TgEvent(user_id=1, chat_id=1, text=text, event_type="message")
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_rejects_excess_work_without_blocking_other_handlers() -> None:
+    module = ModuleRouter()
+    gate = asyncio.Event()
+
+    @module.command("/report", max_concurrency=1, queue_limit=1, busy_text="busy")
+    async def report(ctx: Context) -> None:
+        await gate.wait()
+        await ctx.send_message("report")
+
+    @module.command("/start")
+    async def start(ctx: Context) -> None:
+        await ctx.send_message("hello")
+
+    pub = DummyPublisher()
+    router = Router(publisher=pub)
+    include_router(router, module)
+
+    running = [asyncio.ensure_future(router.dispatch(_event("/report"))) for _ in range(2)]
+    await asyncio.sleep(0)
+    await router.dispatch(_event("/report"))  # слот и очередь заняты
+    await router.dispatch(_event("/start"))
+    assert [r.text for r in pub.sent] == ["busy", "hello"]
+
+    gate.set()
+    await asyncio.gather(*running)
+    assert [r.text for r in pub.sent[2:]] == ["report", "report"]
+
+
+def test_limits_require_max_concurrency() -> None:
+    with pytest.raises(ValueError):
+        ModuleRouter().command("/x", queue_limit=3)
+
+
+def test_decorators_forward_limits_and_reject_unknown_ones() -> None:
+    @regex(r"отчёт (?P<id>\d+)", ignore_case=True, max_concurrency=2, busy_text="busy")
+    async def report(ctx: Context) -> None:
+        return None
+
+    assert (report.__limits__.max_concurrency, report.__limits__.busy_text) == (2, "busy")
+    # опечатка в имени лимита не проходит молча
+    with pytest.raises(TypeError):
+        ModuleRouter().command("/x", max_concurency=2)
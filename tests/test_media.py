@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from tigro.core import Context, ResponseCollector
+from tigro.gateway.aiogram_gateway import _stale_file_id
+from tigro.gateway.media import FileIdCache, MediaResolver
+from tigro.schemas import MediaRef, TgEvent
+
+
+@pytest.mark.asyncio
+async def test_media_is_uploaded_once(tmp_path) -> None:
+    banner = tmp_path / "banner.png"
+    banner.write_bytes(b"png")
+    cache_path = tmp_path / "ids.json"
+    resolver = MediaResolver(lambda path: ("upload", path), FileIdCache(str(cache_path)))
+    sources: list = []
+
+    async def call(source):
+        sources.append(source)
+        await asyncio.sleep(0)
+        return "AgAD-banner"
+
+    ref = MediaRef(key="banner", path=str(banner))
+    await asyncio.gather(*(resolver.send(ref, call, lambda msg: msg) for _ in range(3)))
+
+    assert sources == [("upload", str(banner)), "AgAD-banner", "AgAD-banner"]
+    # кэш переживает перезапуск gateway
+    assert FileIdCache(str(cache_path)).get("banner") == "AgAD-banner"
+
+
+@pytest.mark.asyncio
+async def test_only_stale_file_id_triggers_reupload(tmp_path) -> None:
+    banner = tmp_path / "banner.png"
+    banner.write_bytes(b"png")
+    cache = FileIdCache(str(tmp_path / "ids.json"))
+    cache.set("banner", "AgAD-old")
+    resolver = MediaResolver(lambda path: ("upload", path), cache)
+    ref = MediaRef(key="banner", path=str(banner))
+
+    async def rate_limited(source):
+        raise RuntimeError("Too Many Requests: retry after 5 (file upload)")
+
+    with pytest.raises(RuntimeError):
+        await resolver.send(ref, rate_limited, lambda msg: msg)
+    assert cache.get("banner") == "AgAD-old"
+
+    sources: list = []
+
+    async def stale_then_ok(source):
+        sources.append(source)
+        if source == "AgAD-old":
+            raise RuntimeError("Bad Request: wrong file identifier/HTTP URL specified")
+        return "AgAD-new"
+
+    await resolver.send(ref, stale_then_ok, lambda msg: msg)
+    assert sources == ["AgAD-old", ("upload", str(banner))]
+    assert cache.get("banner") == "AgAD-new"
+
+
+@pytest.mark.asyncio
+async def test_media_group_size_is_checked_in_service() -> None:
+    ctx = Context(TgEvent(user_id=1, chat_id=1, event_type="message"), ResponseCollector())
+    with pytest.raises(ValueError):
+        await ctx.send_media_group(["a.png"])
+    with pytest.raises(ValueError):
+        await ctx.send_media_group([f"{i}.png" for i in range(11)])
+    await ctx.send_media_group(["a.png", "b.png"])
+
+
+def test_gateway_treats_only_bad_request_as_stale_file_id() -> None:
+    assert _stale_file_id(TelegramBadRequest(None, "Bad Request: wrong file identifier/HTTP URL specified"))  # type: ignore[arg-type]
+    assert not _stale_file_id(TelegramBadRequest(None, "Bad Request: message text is empty"))  # type: ignore[arg-type]
+    assert not _stale_file_id(TelegramRetryAfter(None, "Too Many Requests: wrong file identifier", 5))  # type: ignore[arg-type]
+
+
+def test_media_root_confines_uploads(tmp_path) -> None:
+    root = tmp_path / "media"
+    root.mkdir()
+    (root / "banner.png").write_bytes(b"png")
+    (tmp_path / "secret.env").write_text("BOT_TOKEN=1")
+    (root / "link.png").symlink_to(tmp_path / "secret.env")
+    resolver = MediaResolver(lambda path: ("upload", path), FileIdCache(str(tmp_path / "ids.json")), str(root))
+
+    assert resolver.source(MediaRef(key="banner.png")) == ("upload", str((root / "banner.png").resolve()))
+    for path in ("../secret.env", str(tmp_path / "secret.env"), "/etc/passwd", "link.png"):
+        with pytest.raises(PermissionError):
+            resolver.source(MediaRef(path=path))
+
+
+@pytest.mark.asyncio
+async def test_stale_file_id_in_album_reuploads_group(tmp_path) -> None:
+    for name in ("a.png", "b.png"):
+        (tmp_path / name).write_bytes(b"png")
+    cache = FileIdCache(str(tmp_path / "ids.json"))
+    cache.set("a.png", "AgAD-old")
+    resolver = MediaResolver(lambda path: ("upload", path), cache, str(tmp_path))
+    refs = [MediaRef(key="a.png"), MediaRef(key="b.png")]
+    calls: list = []
+
+    async def group_call(sources):
+        calls.append(sources)
+        if "AgAD-old" in sources:
+            raise RuntimeError("Bad Request: wrong file identifier/HTTP URL specified")
+        return [f"AgAD-{i}" for i in range(len(sources))]
+
+    await resolver.send_group(refs, group_call, lambda msg: msg)
+    assert len(calls) == 2 and "AgAD-old" not in calls[1]
+    assert cache.get("a.png") == "AgAD-0" and cache.get("b.png") == "AgAD-1"
@@ -0,0 +1,91 @@
+import pytest
+
+from tigro.core import Context, Router
+from tigro.keyboard import Paginator, cb_btn
+from tigro.matchers import Command
+from tigro.schemas import TgEvent, TgResponse
+
+
+class DummyPublisher:
+    def __init__(self) -> None:
+        self.sent: list[TgResponse] = []
+
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        self.sent.append(resp)
+
+
+class CountingItems:
+    """Последовательность, которая считает прочитанные элементы."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.read = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: slice) -> list[int]:
+        values = list(range(self.size))[index]
+        self.read += len(values)
+        return values
+
+
+def _labels(markup: dict) -> list[list[str]]:
+    return [[btn["text"] for btn in row] for row in markup["inline_keyboard"]]
+
+
+def test_only_visible_page_is_materialized() -> None:
+    items = CountingItems(500)
+    pager = Paginator("items", button=lambda i: cb_btn(f"#{i}", f"item:{i}"), per_page=4, cols=2)
+    cursor = pager.open(items)
+
+    markup = pager.page(cursor, 3)
+    assert _labels(markup) == [["#12", "#13"], ["#14", "#15"], ["◀️", "4/125", "▶️"]]
+    assert items.read == 4
+    assert all(len(btn["callback_data"].encode()) <= 64 for row in markup["inline_keyboard"] for btn in row)
+
+    assert _labels(pager.page(cursor, 999))[-1] == ["◀️", "125/125"]
+
+
+def test_cursor_expires_and_is_evicted() -> None:
+    now = [0.0]
+    pager = Paginator("items", ttl=10, max_cursors=2, clock=lambda: now[0])
+    first = pager.open([cb_btn("a", "a")])
+    pager.open([])
+    pager.open([])
+    assert pager.page(first) is None and len(pager) == 2
+
+    cursor = pager.open([cb_btn("a", "a")])
+    now[0] = 8
+    assert pager.page(cursor) is not None  # обращение продлевает TTL
+    now[0] = 17
+    assert pager.pages(cursor) == 1
+    now[0] = 30
+    assert pager.page(cursor) is None
+
+
+@pytest.mark.asyncio
+async def test_navigation_route_edits_page() -> None:
+    pub = DummyPublisher()
+    router = Router(publisher=pub)
+    pager = Paginator("items", button=lambda i: cb_btn(str(i), f"item:{i}"), per_page=2)
+    pager.attach(router)
+
+    async def list_items(ctx: Context) -> None:
+        await pager.send(ctx, "Список:", list(range(5)), parse_mode="HTML")
+
+    router.register(Command("/list"), list_items)
+    await router.dispatch(TgEvent(user_id=1, chat_id=1, text="/list", event_type="message"))
+    first = pub.sent[-1]
+    assert first.action == "send_message" and _labels(first.markup)[-1] == ["1/3", "▶️"]
+
+    next_data = first.markup["inline_keyboard"][-1][-1]["callback_data"]
+    await router.dispatch(TgEvent(user_id=1, chat_id=1, message_id=10, callback_data=next_data, event_type="callback"))
+    edit = pub.sent[-1]
+    assert edit.action == "edit_message" and edit.text == "Список:" and edit.parse_mode == "HTML"
+    assert edit.metadata == {"edit_msg_id": 10}
+    assert _labels(edit.markup) == [["2"], ["3"], ["◀️", "2/3", "▶️"]]
+
+    await router.dispatch(TgEvent(user_id=1, chat_id=1, callback_data="items:gone:1", event_type="callback"))
+    assert pub.sent[-1].action == "answer_callback"
+
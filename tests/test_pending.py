@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from tigro.gateway.pending import HashedTimerWheel, PendingCalls
+from tigro.gateway.rpc import RpcClient
+
+
+def test_timer_wheel_expires_after_full_rounds_and_cancels() -> None:
+    now = [0.0]
+    wheel = HashedTimerWheel(tick=1.0, slots=4, clock=lambda: now[0])
+    wheel.schedule("short", 2)
+    wheel.schedule("long", 9)
+    wheel.schedule("gone", 3)
+    assert wheel.cancel("gone")
+
+    now[0] = 2.0
+    assert wheel.advance() == ["short"]
+    now[0] = 8.0
+    assert wheel.advance() == []
+    now[0] = 9.0
+    assert wheel.advance() == ["long"]
+    assert len(wheel) == 0
+
+
+@pytest.mark.asyncio
+async def test_pending_calls_resolve_and_timeout() -> None:
+    pending = PendingCalls(tick=0.01)
+    fut = pending.register("a", timeout=1.0)
+    assert pending.resolve("a", {"ok": True})
+    assert await fut == {"ok": True}
+
+    slow = pending.register("b", timeout=0.03)
+    with pytest.raises(asyncio.TimeoutError):
+        await slow
+    assert not pending.resolve("b", {"late": True})
+    assert not pending.resolve("zzz", {})
+    stats = pending.stats
+    assert (stats["resolved"], stats["expired"], stats["late"], stats["unknown"]) == (1, 1, 1, 1)
+    assert stats["pending"] == 0
+    await pending.close()
+
+
+@pytest.mark.asyncio
+async def test_late_response_is_delivered_with_call_context() -> None:
+    delivered = []
+
+    async def on_late(context, payload) -> None:
+        delivered.append((context, payload))
+
+    pending = PendingCalls(tick=0.01, late_policy="deliver", on_late=on_late)
+    with pytest.raises(asyncio.TimeoutError):
+        await pending.register("c", timeout=0.02, context="event-c")
+    pending.resolve("c", {"text": "готово"})
+    await asyncio.sleep(0)
+    assert delivered == [("event-c", {"text": "готово"})]
+    assert pending.stats["late_delivered"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_is_removed_from_table() -> None:
+    pending = PendingCalls(tick=0.01)
+    task = asyncio.ensure_future(pending.register("d", timeout=5))
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.sleep(0)
+    assert len(pending) == 0 and pending.stats["cancelled"] == 1
+    await pending.close()
+
+
+@pytest.mark.asyncio
+async def test_rpc_client_close_stops_ticker_and_cancels_calls() -> None:
+    rpc = RpcClient(pool_size=2)
+    fut = rpc._pending.register("cid", 10.0)
+    await rpc.close()
+
+    assert fut.cancelled()
+    assert rpc._pending._ticker is None
+    assert len(rpc._pending) == 0
@@ -0,0 +1,21 @@
+from tigro.transport.subscriber import PrefetchTuner
+
+
+def test_prefetch_grows_while_saturated_and_shrinks_on_slowdown() -> None:
+    tuner = PrefetchTuner(initial=8, window=10)
+    for _ in range(100):
+        tuner.observe(latency=0.01, inflight=tuner.limit)
+    grown = tuner.limit
+    assert grown > 8
+
+    for _ in range(100):
+        tuner.observe(latency=0.1, inflight=tuner.limit)
+    assert tuner.limit < grown
+    assert tuner.metrics()["decreases"] > 0
+
+
+def test_prefetch_shrinks_when_unused() -> None:
+    tuner = PrefetchTuner(initial=64, window=10)
+    for _ in range(200):
+        tuner.observe(latency=0.01, inflight=2)
+    assert tuner.limit < 16
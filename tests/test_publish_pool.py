@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from tigro.transport.pool import PooledPublisher, rabbit_channel_factory
+
+
+class FakeChannel:
+    def __init__(self, log: list) -> None:
+        self.log = log
+
+    async def publish(self, message, routing_key: str) -> None:
+        await asyncio.sleep(0)
+        if message == "boom":
+            raise ConnectionError("nack")
+        self.log.append((routing_key, message))
+
+
+@pytest.mark.asyncio
+async def test_pooled_publisher_confirms_every_message() -> None:
+    log: list = []
+
+    async def factory() -> FakeChannel:
+        return FakeChannel(log)
+
+    pool = PooledPublisher(factory, size=3, max_batch=8)
+    await asyncio.gather(*(pool.publish(i, "event.user.input") for i in range(50)))
+    with pytest.raises(ConnectionError):
+        await pool.publish("boom", "event.user.input")
+    await pool.close()
+
+    assert sorted(m for _, m in log) == list(range(50))
+    assert pool.stats["published"] == 50
+    assert pool.stats["failed"] == 1
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.channels = 0
+
+    async def channel(self, publisher_confirms: bool = False) -> object:
+        assert publisher_confirms
+        self.channels += 1
+        return object()
+
+
+class FakeBroker:
+    """Как RabbitBroker: connect() идемпотентен и отдаёт своё соединение."""
+
+    def __init__(self) -> None:
+        self.connection = FakeConnection()
+        self.connects = 0
+
+    async def connect(self) -> FakeConnection:
+        self.connects += 1
+        return self.connection
+
+
+@pytest.mark.asyncio
+async def test_channel_factory_reuses_broker_connection() -> None:
+    broker = FakeBroker()
+    pool = PooledPublisher(rabbit_channel_factory(broker), size=3)
+    await pool.start()
+    await pool.close()
+
+    # каналы пула открыты на соединении брокера, новых соединений нет
+    assert broker.connection.channels == 3
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from tigro.core import Context, Router
+from tigro.matchers import Command
+from tigro.replay import EventRecorder, main, read_recording, replay, sanitize_text
+from tigro.schemas import TgEvent, TgResponse
+
+
+class DummyPublisher:
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        return None
+
+
+def make_router(publisher) -> Router:
+    router = Router(publisher=publisher)
+
+    async def start(ctx: Context) -> None:
+        await asyncio.sleep(0.001)
+        await ctx.send_message("hi")
+
+    router.register(Command("/start"), start)
+    return router
+
+
+def test_sanitize_keeps_command_and_shape() -> None:
+    assert sanitize_text("/buy 5 шт") == "/buy 0 xx"
+    assert sanitize_text("Мой номер +7 999") == "xxx xxxxx +0 000"
+
+
+def test_recorder_rotates_and_reads_back(tmp_path: Path) -> None:
+    recorder = EventRecorder(tmp_path, max_bytes=300, compress=True)
+    for i in range(6):
+        recorder.record(TgEvent(user_id=i, chat_id=i, text=f"секрет {i}", event_type="message"))
+    recorder.close()
+
+    files = sorted(tmp_path.glob("*.jsonl.gz"))
+    assert len(files) > 1
+    items = list(read_recording([str(tmp_path)]))
+    assert [ev.user_id for _, ev in items] == list(range(6))
+    assert items[0][1].text == "xxxxxx 0"
+    assert [t for t, _ in items] == sorted(t for t, _ in items)
+
+
+
+def test_rotated_files_keep_real_gaps_and_runs_are_rebased(tmp_path: Path) -> None:
+    def record(directory: Path, count: int) -> None:
+        recorder = EventRecorder(directory, max_bytes=1, compress=False)  # файл на событие
+        for i in range(count):
+            if i:
+                time.sleep(0.1)
+            recorder.record(TgEvent(user_id=i, chat_id=i, event_type="message"))
+        recorder.close()
+
+    record(tmp_path / "run1", 4)
+    record(tmp_path / "run2", 2)
+    assert len(list((tmp_path / "run1").iterdir())) == 4
+
+    times = [t for t, _ in read_recording([str(tmp_path / "run1"), str(tmp_path / "run2")])]
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    # ротация не растягивает паузы: 0.1 с между событиями одного запуска
+    assert all(0.09 <= gap < 0.15 for gap in gaps[:3])
+    # второй запуск продолжает шкалу сразу после первого, без разрыва между запусками
+    assert 0 <= gaps[3] < 0.05 and 0.09 <= gaps[4] < 0.15
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_truncated_recording_is_read_up_to_last_complete_line(tmp_path: Path, compress: bool) -> None:
+    recorder = EventRecorder(tmp_path, compress=compress, sanitize=False)
+    for i in range(200):
+        recorder.record(TgEvent(user_id=i, chat_id=i, text=f"событие {i} " * 5, event_type="message"))
+    recorder.close()
+    (path,) = tmp_path.iterdir()
+    raw = path.read_bytes()
+    # gateway упал: нет gzip-трейлера / последняя строка дописана наполовину
+    path.write_bytes(raw[:-30] if compress else raw + b'{"t": 1.5, "event": {"user_')
+
+    items = list(read_recording([str(tmp_path)]))
+    assert 0 < len(items) <= 200
+    assert [ev.user_id for _, ev in items] == list(range(len(items)))
+    if not compress:
+        assert len(items) == 200
+
+
+@pytest.mark.asyncio
+async def test_replay_reports_latency_percentiles() -> None:
+    events = [(i * 0.001, TgEvent(user_id=1, chat_id=1, text="/start", event_type="message")) for i in range(50)]
+    report = await replay(make_router(DummyPublisher()).dispatch, events, speed=None, concurrency=10)
+    assert report.events == 50 and report.errors == 0
+    assert 0 < report.p50 <= report.p95 <= report.p99
+    assert report.throughput > 0
+
+
+def test_cli_replays_in_process(tmp_path: Path) -> None:
+    recorder = EventRecorder(tmp_path, compress=False, sanitize=False)
+    for _ in range(5):
+        recorder.record(TgEvent(user_id=1, chat_id=1, text="/start", event_type="message"))
+    recorder.close()
+    assert main([str(tmp_path), "--router", "tests.test_replay:make_router", "--max-speed"]) == 0
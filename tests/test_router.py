@@ -38,3 +38,29 @@ async def test_basic_dispatch() -> None:
     )
     await router.dispatch(event)
     assert pub.sent[0].text == "ok"
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor_offloads_cpu_work() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    pub = DummyPublisher()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        router = Router(publisher=pub, executor=pool)
+
+        async def handler(ctx: Context) -> None:
+            total = await ctx.run_in_executor(sum, range(10))
+            await ctx.send_message(str(total))
+
+        router.register(Command("/sum"), cast(Handler, handler))
+        event = TgEvent(
+            user_id=1,
+            chat_id=1,
+            message_id=1,
+            text="/sum",
+            callback_data=None,
+            state=None,
+            event_type="message",
+        )
+        await router.dispatch(event)
+    assert pub.sent[0].text == "45"
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import signal
+from typing import Any
+
+import faststream.rabbit
+import pytest
+
+import tigro.runner as runner
+import tigro.transport.rabbit_bus as rabbit_bus
+import tigro.transport.subscriber as subscriber_mod
+from tigro.core import Router
+from tigro.runner import ServeConfig, serve
+
+
+class FakeProcess:
+    def __init__(self, log: list, index: int, crash: bool) -> None:
+        self.log = log
+        self.index = index
+        self.crash = crash
+        self.alive = True
+        self.exitcode: Any = None
+
+    def start(self) -> None:
+        self.log.append(("start", self.index))
+
+    def is_alive(self) -> bool:
+        if self.crash:
+            self.alive, self.exitcode, self.crash = False, 1, False
+        elif self.alive and sum(1 for entry in self.log if entry[0] == "start") > 1:
+            # перезапущенный воркер жив – просим супервизор остановиться
+            signal.raise_signal(signal.SIGTERM)
+        return self.alive
+
+    def terminate(self) -> None:
+        self.log.append(("terminate", self.index))
+        self.alive, self.exitcode = False, -signal.SIGTERM
+
+    def join(self, timeout: Any = None) -> None:
+        return None
+
+    def kill(self) -> None:
+        self.log.append(("kill", self.index))
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.log: list = []
+        self.procs: list = []
+
+    def Process(self, target: Any, args: tuple, name: str) -> FakeProcess:  # noqa: N802
+        proc = FakeProcess(self.log, args[2], crash=not self.procs)
+        self.procs.append(proc)
+        return proc
+
+
+def make_router(publisher: Any) -> Router:
+    return Router(publisher=publisher)
+
+
+def test_supervisor_restarts_crashed_worker(monkeypatch) -> None:
+    ctx = FakeContext()
+    monkeypatch.setattr(runner.mp, "get_context", lambda method: ctx)
+    previous = signal.getsignal(signal.SIGTERM)
+
+    serve(make_router, workers=1, config=ServeConfig(drain_timeout=0.0), restart_backoff=0.01)
+
+    assert ctx.log == [("start", 0), ("start", 0), ("terminate", 0)]
+    assert ctx.procs[0].exitcode == 1
+    assert signal.getsignal(signal.SIGTERM) is previous
+
+
+@pytest.mark.asyncio
+async def test_worker_drains_subscriber_on_sigterm(monkeypatch) -> None:
+    log: list = []
+    started = asyncio.Event()
+
+    class FakeBroker:
+        def __init__(self, url: str) -> None:
+            self.url = url
+
+        async def connect(self) -> None:
+            log.append("connect")
+
+        async def stop(self) -> None:
+            log.append("broker.stop")
+
+    class FakePublisher:
+        def __init__(self, broker: Any, **kwargs: Any) -> None:
+            self.kwargs = kwargs
+
+        async def publish(self, user_id: int, response: Any) -> None:
+            return None
+
+    class FakeSubscriber:
+        def __init__(self, router: Router, url: str, **kwargs: Any) -> None:
+            self.kwargs = kwargs
+
+        async def start(self) -> None:
+            log.append("subscriber.start")
+            started.set()
+
+        async def stop(self, drain_timeout: float) -> None:
+            log.append(("subscriber.stop", drain_timeout))
+
+    monkeypatch.setattr(faststream.rabbit, "RabbitBroker", FakeBroker)
+    monkeypatch.setattr(rabbit_bus, "RabbitPublisher", FakePublisher)
+    monkeypatch.setattr(subscriber_mod, "AdaptiveSubscriber", FakeSubscriber)
+
+    loop = asyncio.get_running_loop()
+    task = asyncio.ensure_future(runner._worker_loop(make_router, ServeConfig(drain_timeout=3.0), 0))
+    try:
+        await asyncio.wait_for(started.wait(), 1)
+        assert not task.done()
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.wait_for(task, 1)
+    finally:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(sig)
+
+    # новые события больше не берутся, полученные дорабатываются до остановки брокера
+    assert log == ["connect", "subscriber.start", ("subscriber.stop", 3.0), "broker.stop"]
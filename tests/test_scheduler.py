@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from tigro.gateway.scheduler import OutboundScheduler
+
+
+class RetryAfter(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("flood")
+        self.retry_after = retry_after
+
+
+@pytest.mark.asyncio
+async def test_queued_edits_are_coalesced() -> None:
+    scheduler = OutboundScheduler(rate=1000)
+    sent: list[str] = []
+    gate = asyncio.Event()
+
+    async def first() -> str:
+        await gate.wait()
+        sent.append("send")
+        return "send"
+
+    def edit(text: str):
+        async def call() -> str:
+            sent.append(text)
+            return text
+
+        return call
+
+    futures = [scheduler.submit(1, first)]
+    futures += [scheduler.submit(1, edit(f"{i}%"), coalesce_key=("edit", 1, 7)) for i in range(5)]
+    gate.set()
+    results = await asyncio.gather(*futures)
+
+    assert sent == ["send", "4%"]
+    assert results[1:] == ["4%"] * 5
+    assert scheduler.stats["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honoured() -> None:
+    scheduler = OutboundScheduler(rate=1000)
+    attempts = 0
+
+    async def call() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RetryAfter(0.01)
+        return "ok"
+
+    assert await scheduler.submit(1, call) == "ok"
+    assert scheduler.stats["retried"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_calls_get_only_their_share_of_the_rate() -> None:
+    scheduler = OutboundScheduler(rate=100, burst=1, bulk_share=0.2)
+    sent: list[str] = []
+
+    def call(kind: str):
+        async def run() -> None:
+            sent.append(kind)
+
+        return run
+
+    # рассылка на 10 чатов поставлена раньше ответов 10 пользователям
+    bulk = [scheduler.submit(chat_id, call("bulk"), bulk=True) for chat_id in range(10)]
+    interactive = [scheduler.submit(100 + chat_id, call("reply")) for chat_id in range(10)]
+    await asyncio.gather(*interactive)
+    # ответы не ждут рассылку: она идёт не быстрее 20 вызовов/с
+    assert sent.count("bulk") <= 4
+    await asyncio.gather(*bulk)
+    assert sent.count("bulk") == 10
+
+
+@pytest.mark.asyncio
+async def test_per_chat_interval_spans_idle_queue() -> None:
+    scheduler = OutboundScheduler(rate=1000, per_chat_interval=0.1, group_interval=0.2)
+    loop = asyncio.get_running_loop()
+    sent: dict[int, list[float]] = {}
+
+    def call(chat_id: int):
+        async def run() -> None:
+            sent.setdefault(chat_id, []).append(loop.time())
+
+        return run
+
+    await scheduler.submit(1, call(1))
+    # очередь чата опустела, но следующий вызов всё равно ждёт паузу
+    await scheduler.submit(1, call(1))
+    await asyncio.gather(
+        scheduler.submit(-100, call(-100)),
+        scheduler.submit(-100, call(-100)),
+        scheduler.submit(2, call(2)),
+    )
+
+    assert sent[1][1] - sent[1][0] >= 0.09
+    assert sent[-100][1] - sent[-100][0] >= 0.19
+    assert sent[2][0] - sent[1][1] < 0.05  # другие чаты не ждут
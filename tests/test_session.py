@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from tigro.core import Context, ResponseCollector, Router
+from tigro.matchers import Command
+from tigro.schemas import TgEvent, TgResponse
+from tigro.session import MemorySessionStore, SessionManager
+
+
+class DummyPublisher:
+    def __init__(self) -> None:
+        self.sent: list[TgResponse] = []
+
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        self.sent.append(resp)
+
+
+class SlowStore(MemorySessionStore):
+    async def load(self, user_id: int):  # type: ignore[override]
+        await asyncio.sleep(0.01)
+        return await super().load(user_id)
+
+
+def _event(text: str, user_id: int = 1) -> TgEvent:
+    return TgEvent(user_id=user_id, chat_id=user_id, text=text, event_type="message")
+
+
+@pytest.mark.asyncio
+async def test_lazy_load_cache_and_dirty_only_writeback() -> None:
+    store = MemorySessionStore()
+    sessions = SessionManager(store)
+    pub = DummyPublisher()
+    router = Router(publisher=pub, session_manager=sessions)
+
+    async def set_lang(ctx: Context) -> None:
+        session = await ctx.session
+        session["lang"] = "en"
+
+    async def show(ctx: Context) -> None:
+        session = await ctx.session
+        assert session is await ctx.session
+        await ctx.send_message(session.get("lang", "ru"))
+
+    async def ping(ctx: Context) -> None:
+        await ctx.send_message("pong")
+
+    router.register(Command("/lang"), set_lang)
+    router.register(Command("/show"), show)
+    router.register(Command("/ping"), ping)
+
+    await router.dispatch(_event("/ping"))
+    assert store.loads == 0  # сессия не запрашивалась
+
+    await router.dispatch(_event("/show"))
+    await router.dispatch(_event("/lang"))
+    await router.dispatch(_event("/lang"))  # значение не изменилось – без записи
+    await router.dispatch(_event("/show"))
+    assert [r.text for r in pub.sent] == ["pong", "ru", "en"]
+    assert (store.loads, store.saves) == (1, 1)
+    assert await store.load(1) == {"lang": "en"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_coalesced_and_lru_is_bounded() -> None:
+    store = SlowStore()
+    sessions = SessionManager(store, max_size=2)
+    first, second = await asyncio.gather(sessions.get(1), sessions.get(1))
+    assert first is second
+    assert store.loads == 1 and sessions.stats["coalesced"] == 1
+
+    await sessions.get(2)
+    await sessions.get(3)
+    assert len(sessions) == 2
+    await sessions.get(1)
+    assert store.loads == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_save_keeps_session_dirty() -> None:
+    class BrokenStore(MemorySessionStore):
+        async def save(self, user_id: int, data: dict) -> None:  # type: ignore[override]
+            raise ConnectionError("db down")
+
+    sessions = SessionManager(BrokenStore())
+    session = await sessions.get(7)
+    session["visits"] = 1
+    with pytest.raises(ConnectionError):
+        await sessions.save(session)
+    assert session.dirty
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_discards_session_changes() -> None:
+    store = MemorySessionStore()
+    sessions = SessionManager(store)
+    router = Router(publisher=DummyPublisher(), session_manager=sessions)
+
+    async def broken(ctx: Context) -> None:
+        session = await ctx.session
+        session["balance"] = -100
+        raise RuntimeError("db constraint")
+
+    async def ping(ctx: Context) -> None:
+        session = await ctx.session
+        session["pings"] = session.get("pings", 0) + 1
+
+    router.register(Command("/broken"), broken)
+    router.register(Command("/ping"), ping)
+    with pytest.raises(RuntimeError):
+        await router.dispatch(_event("/broken"))
+    await router.dispatch(_event("/ping"))
+    assert await store.load(1) == {"pings": 1}
+
+
+
+@pytest.mark.asyncio
+async def test_overlapping_event_does_not_persist_failed_changes() -> None:
+    store = MemorySessionStore()
+    await store.save(1, {"balance": 10})
+    sessions = SessionManager(store)
+    router = Router(publisher=DummyPublisher(), session_manager=sessions)
+    mutated = asyncio.Event()
+    seen: list = []
+
+    async def broken(ctx: Context) -> None:
+        session = await ctx.session
+        session["balance"] = -100
+        mutated.set()
+        await asyncio.sleep(0.01)  # второе событие успевает начаться
+        raise RuntimeError("db constraint")
+
+    async def ping(ctx: Context) -> None:
+        session = await ctx.session
+        seen.append(session.get("balance"))
+        session["pings"] = session.get("pings", 0) + 1
+
+    router.register(Command("/broken"), broken)
+    router.register(Command("/ping"), ping)
+
+    async def ping_after_mutation() -> None:
+        await mutated.wait()
+        await router.dispatch(_event("/ping"))
+
+    results = await asyncio.gather(router.dispatch(_event("/broken")), ping_after_mutation(), return_exceptions=True)
+    assert isinstance(results[0], RuntimeError) and results[1] is None
+    assert seen == [10]  # изменения упавшего хендлера не видны
+    assert await store.load(1) == {"balance": 10, "pings": 1}
+    assert not sessions._locks
+
+def test_session_requires_manager() -> None:
+    ctx = Context(_event("/x"), ResponseCollector())
+    with pytest.raises(TypeError):
+        ctx.session
@@ -0,0 +1,64 @@
+import pytest
+
+from tigro.core import Context, Router
+from tigro.matchers import Command, CommandArgs, Predicate, Regex, StartsWith, Text, TextAutomaton
+from tigro.schemas import TgEvent, TgResponse
+
+
+class DummyPublisher:
+    def __init__(self) -> None:
+        self.sent: list[TgResponse] = []
+
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        self.sent.append(resp)
+
+
+def _event(text: str) -> TgEvent:
+    return TgEvent(user_id=1, chat_id=1, text=text, event_type="message")
+
+
+def _reply(label: str):
+    async def handler(ctx: Context) -> None:
+        await ctx.send_message(f"{label}:{sorted(ctx.match.items())}")
+
+    handler.__name__ = label
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_text_routes_keep_registration_order_and_pass_groups() -> None:
+    pub = DummyPublisher()
+    router = Router(publisher=pub)
+    router.register(Text("привет", ignore_case=True), _reply("hello"))
+    router.register(Predicate(lambda ev: ev.text == "/buy 0"), _reply("zero"))
+    router.register(CommandArgs("/buy", r"(?P<qty>\d+)"), _reply("buy"))
+    router.register(Command("/buy"), _reply("buy-help"))
+    router.register(Regex(r"заказ (?P<order>\d+)"), _reply("order"))
+    router.register(StartsWith("/"), _reply("any-command"))
+
+    for text in ("ПРИВЕТ", "/buy 0", "/buy@shop_bot 5", "/buy", "где мой заказ 42?", "/help", "просто текст"):
+        await router.dispatch(_event(text))
+
+    assert [r.text for r in pub.sent] == [
+        "hello:[]",
+        "zero:[]",
+        "buy:[('qty', '5')]",
+        "buy-help:[]",
+        "order:[('order', '42')]",
+        "any-command:[]",
+        "Команда не распознана.",
+    ]
+
+
+def test_automaton_isolates_group_names_and_case_flags() -> None:
+    automaton = TextAutomaton([
+        (0, Regex(r"(?P<x>a+)b")),
+        (1, Regex(r"(?P<x>\w+)-(?P=x)")),
+        (2, Text("hello", ignore_case=True)),
+        (3, Regex(r"(?s)dotall")),  # глобальный флаг – проверяется отдельно
+    ])
+    assert automaton.scan("aab") == (0, {"x": "aa"})
+    assert automaton.scan("ho-ho") == (1, {"x": "ho"})
+    assert automaton.scan("AAB") is None  # ignore_case ветки 2 не влияет на ветку 0
+    assert automaton.scan("HeLLo") == (2, {})
+    assert not automaton.covers(3)
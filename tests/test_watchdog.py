@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+import pytest
+
+from tigro.core import Context, Router
+from tigro.matchers import Command
+from tigro.schemas import TgEvent, TgResponse
+from tigro.watchdog import Watchdog
+
+
+class DummyPublisher:
+    async def publish(self, user_id: int, resp: TgResponse) -> None:
+        return None
+
+
+def _event(text: str) -> TgEvent:
+    return TgEvent(user_id=1, chat_id=1, text=text, event_type="message")
+
+
+async def slow_io(ctx: Context) -> None:
+    await asyncio.sleep(0.15)
+
+
+async def blocking(ctx: Context) -> None:
+    time.sleep(0.3)  # блокирует loop
+
+
+@pytest.mark.asyncio
+async def test_watchdog_reports_slow_handler_stall_and_profiles() -> None:
+    watchdog = Watchdog(budget=0.05, stall_threshold=0.1, check_interval=0.02)
+    router = Router(publisher=DummyPublisher(), watchdog=watchdog)
+    router.register(Command("/io"), slow_io)
+    router.register(Command("/cpu"), blocking)
+    watchdog.start()
+    try:
+        await router.dispatch(_event("/io"))
+        slow = [r for r in watchdog.reports if r.kind == "slow_handler"]
+        assert slow and "slow_io" in slow[0].routes[0] and "Command" in slow[0].routes[0]
+        assert "slow_io" in slow[0].stack
+
+        watchdog.start_profiling(interval=0.005)
+        await router.dispatch(_event("/cpu"))
+        folded = watchdog.stop_profiling()
+        stalls = [r for r in watchdog.reports if r.kind == "stall"]
+        assert stalls and "blocking" in stalls[0].stack
+        assert "blocking" in stalls[0].routes[0]
+        assert folded.startswith("dispatch:blocking")
+        assert "test_watchdog.py:blocking" in folded
+    finally:
+        watchdog.stop()
@@ -6,10 +6,12 @@
 которые нужны пользователю: Router, Context, декораторы.
 """
 from tigro.core import Router, Context                 # noqa: F401
-from tigro.decorators import command, callback, message  # noqa: F401
-from tigro.discovery import autodiscover  # noqa: F401
+from tigro.decorators import command, callback, message, text, regex, command_args  # noqa: F401
+from tigro.discovery import autodiscover, autodiscover_package  # noqa: F401
 from tigro.modules import ModuleRouter, include_router  # noqa: F401
-from tigro.keyboard import cb_btn, url_btn, inline_kb, reply_kb, inline_kb_grid  # noqa: F401
+from tigro.keyboard import cb_btn, url_btn, inline_kb, reply_kb, inline_kb_grid, CallbackData, Paginator  # noqa: F401
+from tigro.session import SessionManager, MemorySessionStore  # noqa: F401
+from tigro.runner import serve  # noqa: F401
 
 __all__ = (
     "Router",
@@ -17,6 +19,14 @@ __all__ = (
     "command",
     "callback",
     "message",
+    "text",
+    "regex",
+    "command_args",
     "reply_kb",
     "inline_kb_grid",
+    "CallbackData",
+    "Paginator",
+    "SessionManager",
+    "MemorySessionStore",
+    "serve",
 )
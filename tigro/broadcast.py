@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+"""Массовые рассылки из микросервиса.
+
+Сервис не отправляет сообщение каждому получателю отдельно. Вместо этого
+в очередь `event.broadcast` уходит поток кадров::
+
+    start  – broadcast_id + общий payload (TgResponse);
+    chunk  – порядковый номер + список chat_id и тот же payload;
+    end    – общее количество chunk-кадров.
+
+Payload повторяется в каждом chunk-е (один раз на ``chunk_size``
+получателей), поэтому chunk может обработать любая реплика gateway,
+даже не видевшая start-кадр.
+
+Gateway раздаёт payload получателям с учётом rate limit, сохраняет
+прогресс и после падения продолжает с места остановки. Повторный
+запуск рассылки с тем же ``broadcast_id`` идемпотентен: уже
+отправленные chunk-и gateway пропускает.
+
+SRP  – модуль только нарезает получателей на кадры.
+DIP  – зависит от протокола BroadcastPublisher, а не от RabbitMQ.
+"""
+
+import uuid
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Union
+
+from tigro.contracts import BroadcastPublisher
+from tigro.schemas import BroadcastFrame, TgResponse
+
+__all__ = ("Broadcaster",)
+
+Recipients = Union[Iterable[int], AsyncIterable[int]]
+
+
+class Broadcaster:
+    """Нарезает поток получателей на chunk-кадры и публикует их."""
+
+    __slots__ = ("_publisher", "_chunk_size")
+
+    def __init__(self, publisher: BroadcastPublisher, chunk_size: int = 1000) -> None:
+        if not hasattr(publisher, "publish_broadcast"):
+            raise TypeError(
+                f"{type(publisher).__name__} does not support broadcasts "
+                "(publish_broadcast is missing)"
+            )
+        self._publisher = publisher
+        self._chunk_size = chunk_size
+
+    async def broadcast(
+        self,
+        recipients: Recipients,
+        text: str,
+        *,
+        markup: Optional[Dict[str, Any]] = None,
+        parse_mode: Optional[str] = None,
+        broadcast_id: Optional[str] = None,
+        bot_id: Optional[int] = None,
+    ) -> str:
+        """Опубликовать рассылку. Возвращает broadcast_id.
+
+        *bot_id* – от имени какого бота рассылать (multi-bot gateway).
+        """
+        bid = broadcast_id or uuid.uuid4().hex
+        payload = TgResponse(
+            action="send_message",
+            text=text,
+            markup=markup,
+            parse_mode=parse_mode,
+            bot_id=bot_id,
+        )
+        await self._publisher.publish_broadcast(
+            BroadcastFrame(broadcast_id=bid, kind="start", payload=payload)
+        )
+
+        seq = 0
+        chunk: List[int] = []
+        async for chat_id in _aiter(recipients):
+            chunk.append(int(chat_id))
+            if len(chunk) >= self._chunk_size:
+                await self._publish_chunk(bid, seq, chunk, payload)
+                seq += 1
+                chunk = []
+        if chunk:
+            await self._publish_chunk(bid, seq, chunk, payload)
+            seq += 1
+
+        await self._publisher.publish_broadcast(
+            BroadcastFrame(broadcast_id=bid, kind="end", total_chunks=seq)
+        )
+        print(f"[📣 Broadcaster] Рассылка {bid} опубликована: {seq} chunk-ов")
+        return bid
+
+    async def _publish_chunk(self, bid: str, seq: int, chat_ids: List[int], payload: TgResponse) -> None:
+        await self._publisher.publish_broadcast(
+            BroadcastFrame(broadcast_id=bid, kind="chunk", seq=seq, chat_ids=chat_ids, payload=payload)
+        )
+
+
+async def _aiter(recipients: Recipients):  # noqa: ANN202
+    if hasattr(recipients, "__aiter__"):
+        async for item in recipients:  # type: ignore[union-attr]
+            yield item
+    else:
+        for item in recipients:  # type: ignore[union-attr]
+            yield item
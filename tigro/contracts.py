@@ -11,7 +11,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Protocol, Callable, Awaitable, Sequence, Any
 
-from tigro.schemas import TgEvent, TgResponse
+from tigro.schemas import TgEvent, TgResponse, BroadcastFrame
 
 
 # ---------------- Транспортные абстракции ----------------
@@ -24,6 +24,51 @@ class ResponsePublisher(Protocol):
     async def publish(self, user_id: int, response: TgResponse) -> None: ...
 
 
+class BroadcastPublisher(Protocol):
+    """
+    Публикует кадры массовой рассылки в очередь «event.broadcast».
+    Тело сообщения передаётся один раз на chunk получателей, а не на
+    каждого получателя.
+    """
+
+    async def publish_broadcast(self, frame: BroadcastFrame) -> None: ...
+
+
+class CallbackStore(Protocol):
+    """
+    Серверное хранилище callback_data, не влезающих в 64 байта.
+    В кнопку попадает только короткий ключ.
+    """
+
+    def put(self, payload: str) -> str: ...
+
+    def get(self, key: str) -> str | None: ...
+
+
+class BroadcastProgressStore(Protocol):
+    """
+    Прогресс рассылок на стороне gateway (payload, отправленные chunk-и,
+    счётчики). Несколько реплик gateway должны использовать общее
+    хранилище (БД, Redis…) – иначе прогресс и итоговые счётчики
+    у каждой реплики свои.
+    """
+
+    def load(self, broadcast_id: str) -> dict[str, Any] | None: ...
+
+    def save(self, broadcast_id: str, state: dict[str, Any]) -> None: ...
+
+
+class SessionStore(Protocol):
+    """
+    Постоянное хранилище пользовательских сессий (БД, Redis…).
+    Данные – JSON-совместимый словарь; None – сессии ещё нет.
+    """
+
+    async def load(self, user_id: int) -> dict[str, Any] | None: ...
+
+    async def save(self, user_id: int, data: dict[str, Any]) -> None: ...
+
+
 class EventSource(Protocol):
     """
     Источник входящих событий от gateway_bot.
@@ -44,7 +89,12 @@ class Handler(Protocol):
 
 
 class Matcher(ABC):
-    """Определяет, подходит ли событие этому хендлеру."""
+    """Определяет, подходит ли событие этому хендлеру.
+
+    Матчер может дополнительно определить ``captures(event) -> dict | None``:
+    извлечённые данные Router передаст хендлеру в ``ctx.match``. Тогда
+    Router вызывает только captures (None – не совпало), без match.
+    """
 
     @abstractmethod
     def match(self, event: TgEvent) -> bool: ...
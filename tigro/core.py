@@ -10,9 +10,17 @@ SOLID:
 """
 from __future__ import annotations
 
-from typing import Iterable, Iterator, List, Dict, Any, Literal, cast
-
-from tigro.schemas import TgEvent, TgResponse
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Iterable, Iterator, List, Dict, Any, Literal, Sequence, TypeVar, cast
+
+from tigro.schemas import MediaRef, TgEvent, TgResponse
+from tigro.broadcast import Broadcaster, Recipients
+from tigro.limits import Bulkhead, HandlerLimits
+from tigro.matchers import TextAutomaton, TextPattern
+from tigro.session import Session, SessionManager
+from tigro.watchdog import Watchdog
 from tigro.contracts import (
     Matcher,
     Handler,
@@ -24,6 +32,8 @@ from tigro.contracts import (
 
 __all__ = ("Router", "Context")
 
+T = TypeVar("T")
+
 
 # ------------------------------------------------------------------ #
 # 1. Коллектор ответов (Single Responsibility)                       #
@@ -79,6 +89,7 @@ class SendMessageCommand(MessageCommand):
             action="send_message",
             text=self.text,
             correlation_id=event.correlation_id,
+            bot_id=event.bot_id,
             parse_mode=self.parse_mode,
             **self.kwargs,
         )
@@ -96,12 +107,67 @@ class EditMessageCommand(MessageCommand):
             action="edit_message",
             text=self.text,
             correlation_id=event.correlation_id,
+            bot_id=event.bot_id,
             metadata=meta,
             parse_mode=self.parse_mode,
             **self.kwargs,
         )
 
 
+class AnswerCallbackCommand(MessageCommand):
+    def __init__(self, text: str = "", show_alert: bool = False, **kwargs: Any):
+        self.text = text
+        self.show_alert = show_alert
+        self.kwargs = kwargs
+
+    def to_response(self, event: TgEvent) -> TgResponse:
+        return TgResponse(
+            action="answer_callback",
+            text=self.text,
+            correlation_id=event.correlation_id,
+            bot_id=event.bot_id,
+            metadata={"show_alert": self.show_alert},
+            **self.kwargs,
+        )
+
+
+class SendMediaCommand(MessageCommand):
+    def __init__(self, action: str, media: List[MediaRef], parse_mode: str = "", **kwargs: Any):
+        self.action = action
+        self.media = media
+        self.parse_mode = parse_mode
+        self.kwargs = kwargs
+
+    def to_response(self, event: TgEvent) -> TgResponse:
+        return TgResponse(
+            action=cast(Any, self.action),
+            media=self.media,
+            correlation_id=event.correlation_id,
+            bot_id=event.bot_id,
+            parse_mode=self.parse_mode,
+            **self.kwargs,
+        )
+
+
+def _as_media(
+    source: str | MediaRef,
+    media_type: str,
+    caption: str | None = None,
+    key: str | None = None,
+) -> MediaRef:
+    """Строка → MediaRef: http(s)-ссылка считается URL, иначе путь."""
+    if isinstance(source, MediaRef):
+        return source
+    is_url = source.startswith(("http://", "https://"))
+    return MediaRef(
+        type=cast(Any, media_type),
+        key=key,
+        url=source if is_url else None,
+        path=None if is_url else source,
+        caption=caption,
+    )
+
+
 # ------------------------------------------------------------------ #
 # 3. Контекст (SRP)                                                  #
 # ------------------------------------------------------------------ #
@@ -111,11 +177,46 @@ class Context(Ctx):
     Формирует ответы, не знает о брокере.
     """
 
-    __slots__ = ("_event", "_collector")
+    __slots__ = ("_event", "_collector", "_broadcaster", "_executor", "_match", "_sessions", "_session")
 
-    def __init__(self, event: TgEvent, collector: ResponseCollector):
+    def __init__(
+        self,
+        event: TgEvent,
+        collector: ResponseCollector,
+        broadcaster: Broadcaster | None = None,
+        executor: Executor | None = None,
+        sessions: SessionManager | None = None,
+    ):
         self._event = event
         self._collector = collector
+        self._broadcaster = broadcaster
+        self._executor = executor
+        self._match: Dict[str, Any] = {}
+        self._sessions = sessions
+        self._session: Session | None = None
+
+    @property
+    def event(self) -> TgEvent:
+        """Обрабатываемое событие."""
+        return self._event
+
+    @property
+    def match(self) -> Dict[str, Any]:
+        """Данные, извлечённые матчером: группы Regex/CommandArgs,
+        поля CallbackData."""
+        return self._match
+
+    @property
+    def session(self) -> Awaitable[Session]:
+        """Сессия пользователя: ``session = await ctx.session``.
+
+        Загружается при первом обращении; изменения записываются в
+        хранилище после успешного завершения хендлера. До этого другие
+        события того же пользователя ждут сессию на своём ``ctx.session``.
+        """
+        if self._sessions is None:
+            raise TypeError("Sessions are not configured: pass session_manager to Router")
+        return self._load_session()
 
     # ---------- публичные методы ----------
     async def send_message(self, text: str, parse_mode: str = "", **kwargs: Any) -> None:
@@ -132,11 +233,81 @@ class Context(Ctx):
         self._push_command(cmd)
         return None
 
+    async def answer_callback(self, text: str = "", show_alert: bool = False, **kwargs: Any) -> None:
+        """Сформировать команду «answerCallbackQuery» (toast / alert)."""
+        self._push_command(AnswerCallbackCommand(text, show_alert=show_alert, **kwargs))
+        return None
+
+    async def send_photo(
+        self,
+        photo: str | MediaRef,
+        caption: str | None = None,
+        *,
+        key: str | None = None,
+        parse_mode: str = "",
+        **kwargs: Any,
+    ) -> None:
+        """Отправить фото по ключу, пути в общем хранилище или URL.
+
+        *key* – стабильный ключ кэша file_id (по умолчанию путь/URL).
+        """
+        media = [_as_media(photo, "photo", caption, key)]
+        self._push_command(SendMediaCommand("send_photo", media, parse_mode=parse_mode, **kwargs))
+        return None
+
+    async def send_document(
+        self,
+        document: str | MediaRef,
+        caption: str | None = None,
+        *,
+        key: str | None = None,
+        parse_mode: str = "",
+        **kwargs: Any,
+    ) -> None:
+        """Отправить документ по ключу, пути в общем хранилище или URL."""
+        media = [_as_media(document, "document", caption, key)]
+        self._push_command(SendMediaCommand("send_document", media, parse_mode=parse_mode, **kwargs))
+        return None
+
+    async def send_media_group(
+        self,
+        items: Sequence[str | MediaRef],
+        *,
+        parse_mode: str = "",
+        **kwargs: Any,
+    ) -> None:
+        """Отправить альбом (2–10 элементов); строки трактуются как фото."""
+        if not 2 <= len(items) <= 10:
+            raise ValueError(f"Media group must contain 2–10 items, got {len(items)}")
+        media = [_as_media(item, "photo") for item in items]
+        self._push_command(SendMediaCommand("send_media_group", media, parse_mode=parse_mode, **kwargs))
+        return None
+
+    async def broadcast(self, recipients: Recipients, text: str, **kwargs: Any) -> str:
+        """Запустить массовую рассылку (см. Router.broadcast)."""
+        if self._broadcaster is None:
+            raise TypeError("Broadcasts are not supported by the router publisher")
+        return await self._broadcaster.broadcast(recipients, text, **kwargs)
+
+    async def run_in_executor(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Выполнить CPU-тяжёлую функцию в пуле Router, не блокируя loop.
+
+        Для пула процессов *fn* и аргументы должны сериализоваться pickle.
+        Без настроенного пула используется пул потоков loop по умолчанию.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
 
     # ---------- внутреннее ----------
     def _push_command(self, cmd: MessageCommand) -> None:
         self._collector.add(cmd.to_response(self._event))
 
+    async def _load_session(self) -> Session:
+        if self._session is None:
+            assert self._sessions is not None
+            self._session = await self._sessions.checkout(self._event.user_id)
+        return self._session
+
 
 # ------------------------------------------------------------------ #
 # 4. Router (главный объект)                                         #
@@ -147,36 +318,117 @@ class Router:
 
     Порядок работы:
     1. Выполняет `before`-middlewares.
-    2. Находит первый Matcher, который подходит событию.
+    2. Находит первый Matcher, который подходит событию (текстовые
+       матчеры проверяются разом – одним общим regex, TextAutomaton).
     3. Вызывает связанный Handler.
     4. Если не найден ни один Handler → отправляет «Команда не распознана».
-    5. Публикует буфер ответов через ResponseDispatcher.
-    6. Выполняет `after`-middlewares.
+    5. Записывает изменённую сессию (если хендлер обращался к ctx.session).
+    6. Публикует буфер ответов через ResponseDispatcher.
+    7. Выполняет `after`-middlewares.
     """
 
-    __slots__ = ("_routes", "_dispatcher", "_middlewares")
+    __slots__ = (
+        "_routes",
+        "_dispatcher",
+        "_middlewares",
+        "_broadcaster",
+        "_executor",
+        "_automaton",
+        "_watchdog",
+        "_sessions",
+    )
 
     def __init__(
         self,
         publisher: ResponsePublisher,
         middlewares: List[Middleware] | None = None,
+        executor: Executor | None = None,
+        watchdog: Watchdog | None = None,
+        session_manager: SessionManager | None = None,
     ) -> None:
         self._routes: List[tuple[Matcher, Handler]] = []
         self._dispatcher = ResponseDispatcher(publisher)
         self._middlewares = middlewares or []
+        self._broadcaster = (
+            Broadcaster(cast(Any, publisher)) if hasattr(publisher, "publish_broadcast") else None
+        )
+        self._executor = executor
+        self._automaton: TextAutomaton | None = None
+        self._watchdog = watchdog
+        self._sessions = session_manager
+
+    @property
+    def executor(self) -> Executor | None:
+        """Пул для ctx.run_in_executor (потоки или процессы)."""
+        return self._executor
+
+    @executor.setter
+    def executor(self, value: Executor | None) -> None:
+        self._executor = value
+
+    @property
+    def watchdog(self) -> Watchdog | None:
+        """Детектор медленных хендлеров и зависаний loop."""
+        return self._watchdog
+
+    @watchdog.setter
+    def watchdog(self, value: Watchdog | None) -> None:
+        self._watchdog = value
+
+    @property
+    def session_manager(self) -> SessionManager | None:
+        """Кэш сессий для ctx.session (доступен и middlewares)."""
+        return self._sessions
+
+    @session_manager.setter
+    def session_manager(self, value: SessionManager | None) -> None:
+        self._sessions = value
 
     # ---------- регистрация ----------
-    def register(self, matcher: Matcher, handler: Handler) -> None:
-        """Добавить пару «Matcher → Handler»."""
+    def register(self, matcher: Matcher, handler: Handler, limits: HandlerLimits | None = None) -> None:
+        """Добавить пару «Matcher → Handler».
+
+        *limits* – ограничение конкурентности хендлера (bulkhead): лишние
+        события сразу получают ответ «занято».
+        """
         handler_name = getattr(handler, '__name__', str(handler))
         print(f"[📝 Router] Регистрируем: {type(matcher).__name__} -> {handler_name}")
+        if limits is not None:
+            handler = Bulkhead(handler, limits)
         self._routes.append((matcher, handler))
+        self._automaton = None  # пересоберётся при следующем dispatch
+
+    # ---------- рассылки ----------
+    async def broadcast(
+        self,
+        recipients: Recipients,
+        text: str,
+        **kwargs: Any,
+    ) -> str:
+        """Разослать одно сообщение потоку получателей через gateway.
+
+        *recipients* – итерируемый или асинхронный поток chat_id.
+        kwargs: markup, parse_mode, broadcast_id (для возобновления), bot_id.
+        Возвращает broadcast_id.
+        """
+        if self._broadcaster is None:
+            raise TypeError("Broadcasts are not supported by the router publisher")
+        return await self._broadcaster.broadcast(recipients, text, **kwargs)
+
+    def _text_automaton(self) -> TextAutomaton:
+        if self._automaton is None:
+            self._automaton = TextAutomaton(
+                [(idx, m) for idx, (m, _) in enumerate(self._routes) if isinstance(m, TextPattern)]
+            )
+        return self._automaton
 
     # ---------- основной метод ----------
     async def dispatch(self, event: TgEvent) -> None:
         """Обрабатывает одно событие TgEvent."""
         collector = ResponseCollector()
-        ctx = Context(event, collector)
+        ctx = Context(
+            event, collector, broadcaster=self._broadcaster, executor=self._executor, sessions=self._sessions
+        )
 
         # 1. Pre-middlewares
         for mw in self._middlewares:
@@ -185,13 +437,40 @@ class Router:
         # 2. Поиск хендлера
         handled = False
         print(f"[🔎 Router] Ищем обработчик для события: {event.event_type}, text='{event.text}', callback_data='{event.callback_data}'")
-        for matcher, handler in self._routes:
-            match_result = matcher.match(event)
+        automaton = self._text_automaton()
+        hit = automaton.scan(event.text)
+        for idx, (matcher, handler) in enumerate(self._routes):
             handler_name = getattr(handler, '__name__', str(handler))
+            if automaton.covers(idx):
+                # Текстовый маршрут уже проверен общим regex
+                if hit is None or hit[0] != idx:
+                    continue
+                match_result, groups = True, hit[1]
+            else:
+                # captures() заменяет match(): событие разбирается один раз
+                captures = getattr(matcher, "captures", None)
+                if captures is not None:
+                    groups = captures(event)
+                    match_result = groups is not None
+                else:
+                    match_result, groups = matcher.match(event), None
             print(f"[🔎 Router] Проверяем {type(matcher).__name__} -> {handler_name}: {match_result}")
             if match_result:
                 print(f"[🚀 Router] Handler {handler_name} выбран")
-                await handler(ctx)
+                ctx._match = groups or {}
+                try:
+                    if self._watchdog is not None:
+                        with self._watchdog.track(f"{handler_name} <- {matcher!r}"):
+                            await handler(ctx)
+                    else:
+                        await handler(ctx)
+                except BaseException:
+                    # Частично изменённая сессия не должна попасть в хранилище
+                    # ни с этим, ни со следующим событием: забываем её и
+                    # отпускаем ждущие события – они перечитают сессию
+                    if ctx._session is not None and self._sessions is not None:
+                        self._sessions.release(event.user_id, discard=True)
+                    raise
                 handled = True
                 break
 
@@ -199,10 +478,18 @@ class Router:
             print("[⚠️ Router] Хендлер не найден, отправляем сообщение по умолчанию")
             await ctx.send_message("Команда не распознана.")
 
-        # 3. Публикация
+        # 3. Запись сессии – только если её загрузили и изменили; до этого
+        # другие события пользователя ждут её в checkout()
+        if ctx._session is not None and self._sessions is not None:
+            try:
+                await self._sessions.save(ctx._session)
+            finally:
+                self._sessions.release(event.user_id)
+
+        # 4. Публикация
         responses = list(collector)
         await self._dispatcher.dispatch(event.user_id, responses)
 
-        # 4. Post-middlewares
+        # 5. Post-middlewares
         for mw in self._middlewares:
             await mw.after(event, responses)
@@ -1,39 +1,75 @@
 """
 Удобные декораторы, которые навешивают на хендлер
 атрибут `__matcher__` для дальнейшей регистрации в Router.
+
+Каждый декоратор принимает лимиты конкурентности ``**limits``
+(``max_concurrency`` / ``queue_limit`` / ``busy_text``, см.
+HandlerLimits.build); они сохраняются в атрибуте `__limits__`.
 """
-from typing import Awaitable, Callable, TypeVar
+from typing import Any, Awaitable, Callable, TypeVar, Union
 
-from tigro.matchers import Callback, Command, Predicate
+from tigro.matchers import Callback, Command, CommandArgs, Predicate, Regex, StartsWith, Text
 from tigro.contracts import Matcher
 from tigro.core import Context
+from tigro.limits import HandlerLimits
 from tigro.schemas import TgEvent
 
 F = TypeVar("F", bound=Callable[[Context], Awaitable[None]])
 
 
-def _attach_matcher(matcher: Matcher) -> Callable[[F], F]:
-    """Прикрепить Matcher к функции-хендлеру."""
+def _attach_matcher(matcher: Matcher, **limits: Any) -> Callable[[F], F]:
+    """Прикрепить Matcher (и лимиты – аргументы HandlerLimits.build) к функции-хендлеру."""
+    handler_limits = HandlerLimits.build(**limits)
 
     def decorator(func: F) -> F:
         setattr(func, "__matcher__", matcher)
+        if handler_limits is not None:
+            setattr(func, "__limits__", handler_limits)
         return func
 
     return decorator
 
 
-def command(cmd: str) -> Callable[[F], F]:
-    """@command("/start")"""
-    return _attach_matcher(Command(cmd))
+def command(cmd: str, **limits: Any) -> Callable[[F], F]:
+    """@command("/report", max_concurrency=2, queue_limit=10)"""
+    return _attach_matcher(Command(cmd), **limits)
 
 
-def callback(data: str) -> Callable[[F], F]:
-    """@callback("confirm_email")"""
-    return _attach_matcher(Callback(data))
+def callback(data: Union[str, Matcher], **limits: Any) -> Callable[[F], F]:
+    """@callback("confirm_email") или @callback(Order.filter(action="buy"))"""
+    matcher = data if isinstance(data, Matcher) else Callback(data)
+    return _attach_matcher(matcher, **limits)
 
 
-def message(predicate_fn: Callable[[TgEvent], bool]) -> Callable[[F], F]:
+def message(predicate_fn: Callable[[TgEvent], bool], **limits: Any) -> Callable[[F], F]:
     """
     @message(lambda ev: ev.text and ev.text.isdigit())
     """
-    return _attach_matcher(Predicate(predicate_fn))
+    return _attach_matcher(Predicate(predicate_fn), **limits)
+
+
+def text(
+    value: str,
+    *,
+    ignore_case: bool = False,
+    prefix: bool = False,
+    **limits: Any,
+) -> Callable[[F], F]:
+    """@text("привет", ignore_case=True); prefix=True – «начинается с»."""
+    matcher = StartsWith(value, ignore_case) if prefix else Text(value, ignore_case)
+    return _attach_matcher(matcher, **limits)
+
+
+def regex(
+    pattern: str,
+    *,
+    ignore_case: bool = False,
+    **limits: Any,
+) -> Callable[[F], F]:
+    """@regex(r"заказ (?P<order>\\d+)") – группы доступны в ctx.match."""
+    return _attach_matcher(Regex(pattern, ignore_case), **limits)
+
+
+def command_args(cmd: str, args: str = r"(?P<args>.+)", **limits: Any) -> Callable[[F], F]:
+    """@command_args("/buy", r"(?P<qty>\\d+)") – «/buy 5» → ctx.match["qty"]."""
+    return _attach_matcher(CommandArgs(cmd, args), **limits)
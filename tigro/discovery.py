@@ -13,22 +13,43 @@ from __future__ import annotations
     from tigro.discovery import autodiscover
     autodiscover(router)  # регистрирует все хендлеры текущего модуля
 
+Для больших сервисов есть ``autodiscover_package`` – обходит целый пакет::
+
+    autodiscover_package(router, "myservice.handlers")
+
+Маршруты кэшируются в JSON-манифесте (инвалидация по mtime модулей),
+поэтому при повторном старте модули с хендлерами не импортируются:
+импорт происходит лениво, при первом подходящем событии.
+
 SOLID
 -----
 SRP  – модуль занимается только поиском и регистрацией хендлеров.
 OCP  – при добавлении новых типов декораторов код не изменится.
 LSP  – функции принимают Router и работают с его публичным API.
-ISP  – узкий публичный интерфейс: register_handlers / autodiscover.
+ISP  – узкий публичный интерфейс: register_handlers / autodiscover /
+       autodiscover_package.
 DIP  – зависит от абстракций Router/Matcher/Handler.
 """
 
 from types import ModuleType
-from typing import Mapping, Any
+from typing import Mapping, Any, Dict, List, Optional, Iterator, Tuple
+import dataclasses
+import importlib
+import importlib.util
 import inspect
+import json
+import os
+import pkgutil
 
-from tigro.core import Router
+from tigro import matchers as _matchers
+from tigro.contracts import Matcher
+from tigro.core import Context, Router
+from tigro.limits import HandlerLimits
 
-__all__ = ("register_handlers", "autodiscover")
+__all__ = ("register_handlers", "autodiscover", "autodiscover_package")
+
+_MANIFEST_VERSION = 2
+_MANIFEST_NAME = "tigro-routes.json"
 
 
 # ------------------------------------------------------------------
@@ -45,7 +66,7 @@ def register_handlers(router: Router, namespace: Mapping[str, Any]) -> int:  # n
     count = 0
     for obj in namespace.values():
         if callable(obj) and hasattr(obj, "__matcher__"):
-            router.register(getattr(obj, "__matcher__"), obj)  # type: ignore[arg-type]
+            router.register(getattr(obj, "__matcher__"), obj, getattr(obj, "__limits__", None))  # type: ignore[arg-type]
             count += 1
     return count
 
@@ -59,4 +80,191 @@ def autodiscover(router: Router) -> int:  # noqa: D401
     frame = inspect.currentframe()
     assert frame is not None  # для mypy
     caller_globals = frame.f_back.f_globals  # type: ignore[assignment]
-    return register_handlers(router, caller_globals) 
\ No newline at end of file
+    return register_handlers(router, caller_globals)
+
+
+# ------------------------------------------------------------------
+# Обход пакета + кэш-манифест маршрутов
+# ------------------------------------------------------------------
+
+class _LazyHandler:
+    """Хендлер-заглушка: импортирует модуль при первом вызове."""
+
+    def __init__(self, module: str, qualname: str) -> None:
+        self._module = module
+        self._qualname = qualname
+        self._target: Any = None
+        self.__name__ = qualname
+
+    def resolve(self) -> Any:
+        """Импортировать модуль и вернуть настоящий хендлер."""
+        if self._target is None:
+            print(f"[📦 Discovery] Ленивый импорт {self._module}.{self._qualname}")
+            module = importlib.import_module(self._module)
+            self._target = getattr(module, self._qualname)
+        return self._target
+
+    async def __call__(self, ctx: Context) -> None:
+        await self.resolve()(ctx)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module}.{self._qualname}>"
+
+
+def _dump_matcher(matcher: Matcher) -> Optional[Dict[str, Any]]:
+    """Сериализовать встроенный dataclass-матчер; None – если нельзя."""
+    cls = type(matcher)
+    if cls.__module__ != _matchers.__name__ or not dataclasses.is_dataclass(matcher):
+        return None
+    fields = {f.name: getattr(matcher, f.name) for f in dataclasses.fields(matcher)}
+    if not all(isinstance(v, (str, int, float, bool, type(None))) for v in fields.values()):
+        return None
+    return {"type": cls.__name__, "fields": fields}
+
+
+def _load_matcher(spec: Mapping[str, Any]) -> Matcher:
+    cls = getattr(_matchers, spec["type"])
+    return cls(**spec["fields"])
+
+
+def _iter_modules(package: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """Перечислить (имя модуля, путь к файлу) пакета без импорта модулей."""
+    spec = importlib.util.find_spec(package)
+    if spec is None:
+        raise ModuleNotFoundError(f"Package '{package}' not found")
+    yield package, spec.origin
+    locations = spec.submodule_search_locations
+    if locations is None:
+        return
+    for info in sorted(pkgutil.iter_modules(list(locations)), key=lambda i: i.name):
+        fullname = f"{package}.{info.name}"
+        if info.ispkg:
+            yield from _iter_modules(fullname)
+        else:
+            sub = info.module_finder.find_spec(fullname)  # type: ignore[call-arg]
+            yield fullname, sub.origin if sub else None
+
+
+def _mtime(path: Optional[str]) -> Optional[int]:
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_limits(spec: Optional[Mapping[str, Any]]) -> Optional[HandlerLimits]:
+    return HandlerLimits(**spec) if spec else None
+
+
+def _scan_module(module: ModuleType) -> Tuple[List[Tuple[Matcher, Any]], Dict[str, Any]]:
+    """Найти хендлеры модуля и сформировать запись манифеста."""
+    found: List[Tuple[Matcher, Any]] = []
+    entries: List[Dict[str, Any]] = []
+    eager = False
+    for obj in vars(module).values():
+        if not (callable(obj) and hasattr(obj, "__matcher__")):
+            continue
+        # Пропускаем хендлеры, импортированные из других модулей
+        if getattr(obj, "__module__", module.__name__) != module.__name__:
+            continue
+        matcher = getattr(obj, "__matcher__")
+        found.append((matcher, obj))
+        qualname = getattr(obj, "__qualname__", "")
+        dumped = _dump_matcher(matcher)
+        if dumped is None or "." in qualname or getattr(module, qualname, None) is not obj:
+            eager = True
+        limits = getattr(obj, "__limits__", None)
+        entries.append({
+            "qualname": qualname,
+            "matcher": dumped,
+            "limits": dataclasses.asdict(limits) if limits is not None else None,
+        })
+    return found, {"eager": eager, "handlers": entries}
+
+
+def _read_manifest(path: str, package: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != _MANIFEST_VERSION or data.get("package") != package:
+        return {}
+    return data.get("modules", {})
+
+
+def _write_manifest(path: str, package: str, modules: Dict[str, Any]) -> None:
+    payload = {"version": _MANIFEST_VERSION, "package": package, "modules": modules}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as exc:
+        print(f"[⚠️ Discovery] Не удалось записать манифест {path}: {exc}")
+
+
+def _default_manifest_path(package: str) -> str:
+    spec = importlib.util.find_spec(package)
+    assert spec is not None
+    if spec.submodule_search_locations:
+        base = list(spec.submodule_search_locations)[0]
+    else:
+        base = os.path.dirname(spec.origin or ".")
+    return os.path.join(base, "__pycache__", _MANIFEST_NAME)
+
+
+def autodiscover_package(
+    router: Router,
+    package: str,
+    *,
+    manifest: str | os.PathLike[str] | None = None,
+    lazy: bool = True,
+) -> int:  # noqa: D401
+    """Зарегистрировать хендлеры всех модулей пакета *package*.
+
+    При ``lazy=True`` используется манифест маршрутов (по умолчанию
+    ``<package>/__pycache__/tigro-routes.json``). Если mtime модуля не
+    изменился, его маршруты берутся из манифеста, а сам модуль
+    импортируется только при первом подходящем событии. Модули с
+    несериализуемыми матчерами (например, ``Predicate``) всегда
+    импортируются сразу.
+
+    Возвращает количество зарегистрированных хендлеров.
+    """
+    path = os.fspath(manifest) if manifest is not None else _default_manifest_path(package)
+    cached = _read_manifest(path, package) if lazy else {}
+    modules: Dict[str, Any] = {}
+    count = 0
+    hits = 0
+
+    for name, origin in _iter_modules(package):
+        mtime = _mtime(origin)
+        entry = cached.get(name)
+        if lazy and entry is not None and mtime is not None and entry.get("mtime") == mtime and not entry.get("eager"):
+            for item in entry["handlers"]:
+                router.register(
+                    _load_matcher(item["matcher"]),
+                    _LazyHandler(name, item["qualname"]),  # type: ignore[arg-type]
+                    _load_limits(item.get("limits")),
+                )
+                count += 1
+            modules[name] = entry
+            hits += 1
+            continue
+
+        module = importlib.import_module(name)
+        found, entry = _scan_module(module)
+        for matcher, handler in found:
+            router.register(matcher, handler, getattr(handler, "__limits__", None))
+            count += 1
+        entry["mtime"] = mtime
+        modules[name] = entry
+
+    if lazy:
+        _write_manifest(path, package, modules)
+    print(f"[📦 Discovery] {package}: {count} хендлеров, из манифеста модулей: {hits}/{len(modules)}")
+    return count
@@ -0,0 +1,184 @@
+"""
+Circuit breaker для RPC-вызовов gateway.
+
+Если сервис лежит, каждое обновление ждёт полный таймаут RpcClient.call,
+pending-вызовы копятся, и gateway замедляется сам. Breaker считает
+подряд идущие таймауты/ошибки по ключу (сервис, маршрут) и после
+*failure_threshold* неудач «размыкается»: вызовы сразу получают
+CircuitOpenError, а пользователь – fallback-сообщение. Через
+*reset_timeout* breaker пропускает пробный вызов (half-open): успех
+замыкает цепь, неудача снова размыкает её.
+
+    closed ──(N неудач)──▶ open ──(reset_timeout)──▶ half_open
+      ▲                                                │
+      └──────────────(успешная проба)──────────────────┘
+
+SRP  – модуль только решает, пропускать ли вызов.
+DIP  – защищаемый вызов передаётся фабрикой корутины.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Literal, Optional, TypeVar
+
+__all__ = ("CircuitBreaker", "CircuitBreakers", "CircuitOpenError")
+
+T = TypeVar("T")
+State = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpenError(RuntimeError):
+    """Breaker разомкнут – вызов не выполнялся."""
+
+    def __init__(self, key: Hashable, retry_in: float) -> None:
+        super().__init__(f"Circuit {key!r} is open, retry in {retry_in:.1f}s")
+        self.key = key
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Breaker одного направления."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "",
+    ) -> None:
+        """
+        failure_threshold – сколько неудач подряд размыкают цепь;
+        reset_timeout     – через сколько секунд пробовать снова;
+        half_open_max     – сколько пробных вызовов одновременно.
+        """
+        self._threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._half_open_max = half_open_max
+        self._clock = clock
+        self._name = name
+        self._state: State = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._stats: Dict[str, int] = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> State:
+        if self._state == "open" and self._clock() >= self._opened_at + self._reset_timeout:
+            return "half_open"
+        return self._state
+
+    def retry_in(self) -> float:
+        if self._state != "open":
+            return 0.0
+        return max(0.0, self._opened_at + self._reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        """Можно ли выполнить вызов. В half-open занимает слот пробы."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open":
+            if self._state == "open":
+                self._transition("half_open")
+            if self._probes < self._half_open_max:
+                self._probes += 1
+                return True
+        self._stats["rejected"] += 1
+        return False
+
+    def record_success(self) -> None:
+        self._stats["calls"] += 1
+        self._failures = 0
+        if self._state == "half_open":
+            self._probes = max(0, self._probes - 1)
+            self._transition("closed")
+
+    def record_failure(self) -> None:
+        self._stats["calls"] += 1
+        self._stats["failures"] += 1
+        self._failures += 1
+        if self._state == "half_open":
+            self._probes = max(0, self._probes - 1)
+            self._open()
+        elif self._state == "closed" and self._failures >= self._threshold:
+            self._open()
+
+    def abandon(self) -> None:
+        """Вызов отменён без результата: освободить слот пробы."""
+        if self._state == "half_open":
+            self._probes = max(0, self._probes - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            state=self.state,
+            consecutive_failures=self._failures,
+            retry_in=round(self.retry_in(), 3),
+        )
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._stats["opened"] += 1
+        self._transition("open")
+
+    def _transition(self, state: State) -> None:
+        if state != self._state:
+            print(f"[🔌 Breaker] {self._name or 'circuit'}: {self._state} → {state}")
+            self._state = state
+
+
+class CircuitBreakers:
+    """Набор breaker-ов по ключу (сервис, маршрут) + fallback-текст."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        fallback_text: str = "⚠️ Сервис временно недоступен, попробуйте позже",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._params = dict(
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+            half_open_max=half_open_max,
+            clock=clock,
+        )
+        self._breakers: Dict[Hashable, CircuitBreaker] = {}
+        self.fallback_text = fallback_text
+
+    def get(self, key: Hashable) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(name=str(key), **self._params)  # type: ignore[arg-type]
+        return breaker
+
+    def is_open(self, key: Hashable) -> bool:
+        """Разомкнут ли breaker (без занятия слота пробы)."""
+        breaker = self._breakers.get(key)
+        return breaker is not None and breaker.state == "open"
+
+    async def call(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Выполнить *fn* под защитой breaker-а *key*.
+
+        Любое исключение (в т.ч. TimeoutError) считается неудачей.
+        """
+        breaker = self.get(key)
+        if not breaker.allow():
+            raise CircuitOpenError(key, breaker.retry_in())
+        try:
+            result = await fn()
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.abandon()  # отмена – не вердикт о здоровье сервиса
+            raise
+        breaker.record_success()
+        return result
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Состояние всех breaker-ов – для метрик и health-check."""
+        return {str(key): breaker.snapshot() for key, breaker in self._breakers.items()}
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+"""Приём массовых рассылок на стороне gateway.
+
+Кадры из `event.broadcast` (см. ``tigro.broadcast``) раздаются получателям
+окнами по ``window`` сообщений. Отправка идёт через OutboundScheduler,
+поэтому рассылка не пробивает лимиты Telegram.
+
+Каждый chunk несёт payload, поэтому его может обработать любая реплика
+gateway, подписанная на общую очередь, – в том числе не получившая
+start-кадр. Прогресс (обработанные chunk-и, смещение внутри текущего
+chunk-а, счётчики) сохраняется после каждого окна – в пуле потоков, чтобы
+операции хранилища не блокировали event loop. Если gateway упал,
+неподтверждённый chunk придёт повторно и продолжится со смещения,
+а уже отправленные chunk-и будут пропущены.
+
+BroadcastStore держит прогресс в локальных JSON-файлах и годится для
+одной реплики. Нескольким репликам нужно общее хранилище с тем же
+интерфейсом (``BroadcastProgressStore``), иначе итоговые счётчики
+и ``finished`` у каждой реплики свои.
+
+SRP  – BroadcastStore хранит прогресс, BroadcastConsumer раздаёт сообщения.
+DIP  – отправка, публикация прогресса и хранилище передаются извне.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from tigro.contracts import BroadcastProgressStore
+from tigro.schemas import BroadcastFrame, BroadcastProgress, TgResponse
+
+__all__ = ("BroadcastStore", "BroadcastConsumer")
+
+SendFn = Callable[[int, TgResponse], Awaitable[Any]]
+ProgressFn = Callable[[BroadcastProgress], Awaitable[None]]
+
+
+class BroadcastStore:
+    """Хранилище прогресса рассылок: один JSON-файл на broadcast_id."""
+
+    def __init__(self, directory: str = ".tigro-broadcasts") -> None:
+        self._dir = directory
+
+    def _path(self, broadcast_id: str) -> str:
+        safe = "".join(ch for ch in broadcast_id if ch.isalnum() or ch in "-_")
+        return os.path.join(self._dir, f"{safe}.json")
+
+    def load(self, broadcast_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(broadcast_id), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, broadcast_id: str, state: Dict[str, Any]) -> None:
+        os.makedirs(self._dir, exist_ok=True)
+        path = self._path(broadcast_id)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+class BroadcastConsumer:
+    """Обрабатывает кадры рассылки и раздаёт payload получателям."""
+
+    def __init__(
+        self,
+        send: SendFn,
+        store: Optional[BroadcastProgressStore] = None,
+        on_progress: Optional[ProgressFn] = None,
+        window: int = 50,
+    ) -> None:
+        self._send = send
+        self._store: BroadcastProgressStore = store or BroadcastStore()
+        self._on_progress = on_progress
+        self._window = window
+
+    async def handle(self, frame: BroadcastFrame) -> None:
+        """Обработать один кадр. Исключение → кадр будет доставлен повторно.
+
+        Chunk без payload (кадры старого формата, start которых обработала
+        другая реплика или прогресс потерян) повтор не исправит: он
+        логируется и отбрасывается.
+        """
+        state = await asyncio.to_thread(self._store.load, frame.broadcast_id)
+        if state is None:
+            state = {
+                "payload": None,
+                "done": [],
+                "cursor": {},
+                "sent": 0,
+                "failed": 0,
+                "total_chunks": None,
+            }
+        if state.get("payload") is None and frame.payload is not None:
+            state["payload"] = frame.payload.model_dump()
+
+        if frame.kind == "start":
+            await self._save(frame.broadcast_id, state)
+            return None
+
+        if frame.kind == "end":
+            state["total_chunks"] = frame.total_chunks
+            await self._save(frame.broadcast_id, state)
+            await self._report(frame.broadcast_id, state)
+            return None
+
+        if state["payload"] is None:
+            print(f"[⚠️ Broadcast] {frame.broadcast_id}#{frame.seq}: payload неизвестен, кадр отброшен")
+            return None
+
+        if frame.seq in state["done"]:
+            print(f"[📣 Broadcast] {frame.broadcast_id}#{frame.seq} уже отправлен, пропускаем")
+            return None
+
+        payload = TgResponse(**state["payload"])
+        key = str(frame.seq)
+        offset = int(state["cursor"].get(key, 0))
+        chat_ids = frame.chat_ids
+        while offset < len(chat_ids):
+            window = chat_ids[offset : offset + self._window]
+            results = await asyncio.gather(
+                *(self._send(chat_id, payload) for chat_id in window),
+                return_exceptions=True,
+            )
+            failed = sum(isinstance(r, BaseException) for r in results)
+            state["sent"] += len(results) - failed
+            state["failed"] += failed
+            offset += len(window)
+            state["cursor"][key] = offset
+            await self._save(frame.broadcast_id, state)
+            await self._report(frame.broadcast_id, state)
+
+        state["cursor"].pop(key, None)
+        state["done"].append(frame.seq)
+        await self._save(frame.broadcast_id, state)
+        await self._report(frame.broadcast_id, state)
+        return None
+
+    async def _save(self, broadcast_id: str, state: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._store.save, broadcast_id, state)
+
+    async def _report(self, broadcast_id: str, state: Dict[str, Any]) -> None:
+        total = state.get("total_chunks")
+        progress = BroadcastProgress(
+            broadcast_id=broadcast_id,
+            sent=state["sent"],
+            failed=state["failed"],
+            chunks_done=len(state["done"]),
+            total_chunks=total,
+            finished=total is not None and len(state["done"]) >= total,
+        )
+        print(
+            f"[📣 Broadcast] {broadcast_id}: sent={progress.sent} failed={progress.failed} "
+            f"chunks={progress.chunks_done}/{total if total is not None else '?'}"
+        )
+        if self._on_progress is not None:
+            await self._on_progress(progress)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+"""Отпечатки отрисованных сообщений: пропуск правок без изменений.
+
+Пользователь дважды нажимает кнопку, сервис повторно отвечает тем же
+``edit_message`` – gateway вызывает ``edit_text`` с прежними текстом и
+клавиатурой, тратит вызов API и получает от Telegram ошибку «message is
+not modified». RenderCache хранит отпечаток (text, parse_mode, markup)
+последней отрисовки каждого ``(bot, chat_id, message_id)`` и отбрасывает
+такие правки до обращения к Telegram.
+
+SRP  – модуль только помнит, что уже показано пользователю.
+DIP  – вызов Telegram передаётся фабрикой корутины; ошибка распознаётся
+       по тексту, без зависимости от конкретного фреймворка.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+__all__ = ("RenderCache",)
+
+_NOT_MODIFIED = "message is not modified"
+
+
+class RenderCache:
+    """Ограниченный LRU-кэш отпечатков по ключу сообщения."""
+
+    def __init__(self, max_items: int = 100_000) -> None:
+        self._max_items = max_items
+        self._prints: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._stats: Dict[str, int] = {"edits": 0, "suppressed": 0, "not_modified": 0}
+
+    def __len__(self) -> int:
+        return len(self._prints)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """edits – отправлено правок, suppressed – отброшено до вызова API,
+        not_modified – Telegram всё же ответил «message is not modified»."""
+        return dict(self._stats, cached=len(self._prints))
+
+    @staticmethod
+    def fingerprint(text: Optional[str], parse_mode: Optional[str], markup: Optional[Dict[str, Any]]) -> bytes:
+        payload = json.dumps([text or "", parse_mode or "", markup], sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+    def skip(self, key: Hashable, fingerprint: bytes) -> bool:
+        """True – сообщение *key* уже показано с этим отпечатком (правка
+        засчитывается как отброшенная)."""
+        if self._prints.get(key) != fingerprint:
+            return False
+        self._prints.move_to_end(key)
+        self._stats["suppressed"] += 1
+        return True
+
+    def remember(self, key: Hashable, fingerprint: bytes) -> None:
+        self._prints[key] = fingerprint
+        self._prints.move_to_end(key)
+        while len(self._prints) > self._max_items:
+            self._prints.popitem(last=False)
+
+    def forget(self, key: Hashable) -> None:
+        self._prints.pop(key, None)
+
+    async def edit(self, key: Hashable, fingerprint: bytes, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Выполнить правку, если она что-то меняет; None – правка отброшена."""
+        if self.skip(key, fingerprint):
+            return None
+        try:
+            result = await call()
+        except Exception as exc:
+            if _NOT_MODIFIED not in str(exc).lower():
+                self.forget(key)  # состояние сообщения неизвестно
+                raise
+            self._stats["not_modified"] += 1
+            self.remember(key, fingerprint)
+            return None
+        self._stats["edits"] += 1
+        self.remember(key, fingerprint)
+        return result
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+"""Отправка медиа с кэшем file_id.
+
+Сервис ссылается на медиа через ``MediaRef`` (ключ, путь в общем хранилище
+или URL). Gateway загружает файл в Telegram один раз, запоминает
+``key → file_id`` в персистентном кэше и при следующих отправках передаёт
+только file_id.
+
+SRP  – FileIdCache хранит соответствия, MediaResolver решает, что отправлять.
+DIP  – конкретные объекты фреймворка (InputFile, Message) создаются и
+       разбираются функциями, которые передаёт gateway.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from tigro.schemas import MediaRef
+
+__all__ = ("FileIdCache", "MediaResolver", "is_stale_file_id")
+
+# Формулировки Bot API для file_id, который нельзя использовать повторно
+_STALE_FILE_ID = (
+    "wrong file identifier",
+    "wrong remote file identifier",
+    "file reference expired",
+    "file_reference_expired",
+    "type of file mismatch",
+)
+
+
+def is_stale_file_id(exc: BaseException) -> bool:
+    """Отклонил ли Telegram именно закэшированный file_id."""
+    message = str(exc).lower()
+    return any(phrase in message for phrase in _STALE_FILE_ID)
+
+
+class FileIdCache:
+    """Персистентный кэш ``key → file_id`` в JSON-файле."""
+
+    def __init__(self, path: str = ".tigro-file-ids.json") -> None:
+        self._path = path
+        self._data: Dict[str, str] = {}
+        try:
+            with open(path, encoding="utf-8") as fh:
+                self._data = dict(json.load(fh))
+        except (OSError, ValueError):
+            self._data = {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self._data.get(key)
+
+    def set(self, key: str, file_id: str) -> None:
+        if self._data.get(key) == file_id:
+            return None
+        self._data[key] = file_id
+        self._flush()
+
+    def discard(self, key: str) -> None:
+        if self._data.pop(key, None) is not None:
+            self._flush()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _flush(self) -> None:
+        tmp = f"{self._path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(self._data, fh, ensure_ascii=False)
+            os.replace(tmp, self._path)
+        except OSError as exc:
+            print(f"[⚠️ Media] Не удалось сохранить кэш file_id: {exc}")
+
+
+class MediaResolver:
+    """Подставляет file_id из кэша или загружает файл и запоминает file_id."""
+
+    def __init__(
+        self,
+        input_file: Callable[[str], Any],
+        cache: Optional[FileIdCache] = None,
+        media_root: Optional[str] = None,
+        namespace: Optional[str] = None,
+        stale_error: Callable[[BaseException], bool] = is_stale_file_id,
+    ) -> None:
+        """
+        input_file  – фабрика объекта загрузки по локальному пути
+                      (для aiogram – FSInputFile);
+        media_root  – каталог общего хранилища: относительные пути и
+                      ссылки только по ключу ищутся в нём, абсолютные
+                      пути и выход за его пределы (``../``, симлинки)
+                      запрещены. Без media_root gateway загрузит любой
+                      доступный ему файл – задавайте его, если сервисы
+                      не полностью доверенные;
+        namespace   – префикс ключей кэша (file_id уникальны для бота);
+        stale_error – ошибка означает «file_id недействителен»: только
+                      тогда файл загружается заново.
+        """
+        self._input_file = input_file
+        self._cache = cache if cache is not None else FileIdCache()
+        self._media_root = media_root
+        self._namespace = namespace
+        self._stale_error = stale_error
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {"hits": 0, "uploads": 0}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, cached=len(self._cache))
+
+    def cache_key(self, ref: MediaRef) -> str:
+        key = ref.key or ref.path or ref.url
+        if not key:
+            raise ValueError("MediaRef requires key, path or url")
+        return f"{self._namespace}:{key}" if self._namespace else key
+
+    def source(self, ref: MediaRef) -> Any:
+        """Что передать в Telegram: file_id, URL или загружаемый файл."""
+        file_id = self._cache.get(self.cache_key(ref))
+        if file_id is not None:
+            self._stats["hits"] += 1
+            return file_id
+        if ref.url:
+            # Telegram скачает файл сам – трафик gateway не тратится
+            return ref.url
+        path = self._local_path(ref.path or ref.key or "")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Media '{ref.key or path}' is not cached and not found at {path}")
+        self._stats["uploads"] += 1
+        return self._input_file(path)
+
+    def _local_path(self, path: str) -> str:
+        """Путь к файлу для загрузки; PermissionError – вне media_root."""
+        if not self._media_root:
+            return path
+        if os.path.isabs(path):
+            raise PermissionError(f"Media path {path!r} must be relative to media_root")
+        root = os.path.realpath(self._media_root)
+        resolved = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, resolved]) != root:
+            raise PermissionError(f"Media path {path!r} is outside media_root")
+        return resolved
+
+    def remember(self, ref: MediaRef, file_id: Optional[str]) -> None:
+        if file_id:
+            self._cache.set(self.cache_key(ref), file_id)
+
+    async def send(
+        self,
+        ref: MediaRef,
+        call: Callable[[Any], Awaitable[Any]],
+        file_id_of: Callable[[Any], Optional[str]],
+    ) -> Any:
+        """Отправить одно медиа. Параллельные отправки одного ключа
+        загружают файл только один раз – остальные ждут file_id."""
+        key = self.cache_key(ref)
+        if self._cache.get(key) is not None:
+            return await self._send_cached(ref, call, file_id_of)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            result = await self._send_cached(ref, call, file_id_of)
+        if not lock.locked():
+            self._locks.pop(key, None)
+        return result
+
+    async def send_group(
+        self,
+        refs: Sequence[MediaRef],
+        call: Callable[[List[Any]], Awaitable[Sequence[Any]]],
+        file_id_of: Callable[[Any], Optional[str]],
+    ) -> Sequence[Any]:
+        """Отправить альбом; file_id сохраняются для каждого элемента.
+
+        Telegram не сообщает, какой элемент альбома отклонён, поэтому при
+        протухшем file_id кэш сбрасывается для всего альбома и он
+        отправляется ещё раз с загрузкой файлов.
+        """
+        keys = [self.cache_key(ref) for ref in refs]
+        cached = [key for key in keys if self._cache.get(key) is not None]
+        try:
+            result = await call([self.source(ref) for ref in refs])
+        except Exception as exc:  # noqa: BLE001
+            if not cached or not self._stale_error(exc):
+                raise
+            print(f"[⚠️ Media] file_id в альбоме {keys} отклонён: {exc}")
+            for key in cached:
+                self._cache.discard(key)
+            result = await call([self.source(ref) for ref in refs])
+        for ref, message in zip(refs, result or ()):
+            self.remember(ref, file_id_of(message))
+        return result
+
+    async def _send_cached(
+        self,
+        ref: MediaRef,
+        call: Callable[[Any], Awaitable[Any]],
+        file_id_of: Callable[[Any], Optional[str]],
+    ) -> Any:
+        key = self.cache_key(ref)
+        cached = self._cache.get(key)
+        try:
+            result = await call(self.source(ref))
+        except Exception as exc:  # noqa: BLE001
+            if cached is None or not self._stale_error(exc):
+                raise
+            # file_id протух (например, другой бот) – загружаем заново
+            print(f"[⚠️ Media] file_id для '{key}' отклонён: {exc}")
+            self._cache.discard(key)
+            result = await call(self.source(ref))
+        self.remember(ref, file_id_of(result))
+        return result
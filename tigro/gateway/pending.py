@@ -0,0 +1,238 @@
+"""
+Таблица ожидающих RPC-вызовов с общим колесом таймеров.
+
+`asyncio.wait_for` на каждый вызов создаёт отдельный таймер и обёртку
+задачи; при десятках тысяч вызовов в полёте это заметная нагрузка на
+event loop. PendingCalls хранит только future по correlation_id, а сроки
+отслеживает HashedTimerWheel: постановка, отмена и истечение – O(1),
+а на весь gateway работает одна периодическая задача-«тикер».
+
+Ответ, пришедший после таймаута, не теряется молча: его учитывает
+статистика, а политика ``late_policy="deliver"`` передаёт его в
+колбэк ``on_late`` вместе с контекстом исходного вызова.
+
+SRP  – модуль только сопоставляет ответы с ожидающими вызовами.
+DIP  – время берётся из переданных часов, транспорт модулю неизвестен.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Literal, Optional, Set, Tuple, TypeVar
+
+__all__ = ("HashedTimerWheel", "PendingCalls")
+
+K = TypeVar("K", bound=Hashable)
+LatePolicy = Literal["discard", "deliver"]
+LateHandler = Callable[[Any, Dict[str, Any]], Awaitable[None]]
+
+
+class HashedTimerWheel(Generic[K]):
+    """Хэшированное колесо таймеров (Varghese & Lauck).
+
+    Срок округляется вверх до *tick*; ключ кладётся в слот
+    ``(cursor + ticks) % slots`` с числом оставшихся полных оборотов.
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.05,
+        slots: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if tick <= 0 or slots < 1:
+            raise ValueError("tick and slots must be positive")
+        self._tick = tick
+        self._clock = clock
+        self._slots: List[Dict[K, int]] = [{} for _ in range(slots)]
+        self._where: Dict[K, int] = {}
+        self._cursor = 0
+        self._time = clock()
+
+    @property
+    def tick(self) -> float:
+        return self._tick
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._where
+
+    def schedule(self, key: K, timeout: float) -> None:
+        """Поставить таймер *key* через *timeout* секунд (перезаписывает старый)."""
+        self.cancel(key)
+        if not self._where:
+            # Колесо простаивало – не прокручиваем пустые обороты
+            self._time = self._clock()
+        elapsed = self._clock() - self._time
+        ticks = max(1, math.ceil((elapsed + timeout) / self._tick))
+        size = len(self._slots)
+        slot = (self._cursor + ticks) % size
+        self._slots[slot][key] = (ticks - 1) // size
+        self._where[key] = slot
+
+    def cancel(self, key: K) -> bool:
+        slot = self._where.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def advance(self) -> List[K]:
+        """Прокрутить колесо до текущего времени и вернуть истёкшие ключи."""
+        expired: List[K] = []
+        size = len(self._slots)
+        now = self._clock()
+        while now - self._time >= self._tick:
+            self._time += self._tick
+            self._cursor = (self._cursor + 1) % size
+            bucket = self._slots[self._cursor]
+            if not bucket:
+                continue
+            for key, rounds in list(bucket.items()):
+                if rounds:
+                    bucket[key] = rounds - 1
+                else:
+                    del bucket[key]
+                    del self._where[key]
+                    expired.append(key)
+        return expired
+
+
+class PendingCalls:
+    """Ожидающие ответа вызовы: correlation_id → future (+ контекст вызова)."""
+
+    def __init__(
+        self,
+        tick: float = 0.05,
+        slots: int = 512,
+        late_policy: LatePolicy = "discard",
+        on_late: Optional[LateHandler] = None,
+        late_window: int = 10_000,
+    ) -> None:
+        """
+        tick / slots – точность и размер колеса таймеров;
+        late_policy  – что делать с ответом после таймаута: "discard" –
+                       только учесть, "deliver" – передать в *on_late*;
+        late_window  – сколько истёкших вызовов помнить, чтобы отличать
+                       опоздавший ответ от чужого/неизвестного.
+        """
+        if late_policy not in ("discard", "deliver"):
+            raise ValueError(f"Unknown late_policy: {late_policy!r}")
+        if late_policy == "deliver" and on_late is None:
+            raise ValueError("late_policy='deliver' requires on_late")
+        self._wheel: HashedTimerWheel[str] = HashedTimerWheel(tick, slots)
+        self._calls: Dict[str, Tuple[asyncio.Future, Any]] = {}
+        self._expired: "OrderedDict[str, Any]" = OrderedDict()
+        self._late_policy = late_policy
+        self._on_late = on_late
+        self._late_window = late_window
+        self._ticker: Optional[asyncio.Task] = None
+        self._late_tasks: Set[asyncio.Task] = set()
+        self._stats: Dict[str, int] = {
+            "registered": 0,
+            "resolved": 0,
+            "expired": 0,
+            "cancelled": 0,
+            "late": 0,
+            "late_delivered": 0,
+            "unknown": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Публичный API
+    # ------------------------------------------------------------------
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, pending=len(self._calls))
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def register(self, cid: str, timeout: float, context: Any = None) -> asyncio.Future:
+        """Зарегистрировать вызов. Future завершится ответом или TimeoutError.
+
+        *context* (например, исходный TgEvent) передаётся в *on_late*.
+        """
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        fut.add_done_callback(lambda f, cid=cid: self._on_done(cid, f))
+        self._calls[cid] = (fut, context)
+        self._wheel.schedule(cid, timeout)
+        self._stats["registered"] += 1
+        if self._ticker is None or self._ticker.done():
+            self._ticker = loop.create_task(self._tick())
+        return fut
+
+    def resolve(self, cid: Optional[str], payload: Dict[str, Any]) -> bool:
+        """Передать ответ ожидающему вызову. False – вызов уже не ждёт."""
+        entry = self._calls.pop(cid, None) if cid is not None else None
+        if entry is not None:
+            self._wheel.cancel(cid)  # type: ignore[arg-type]
+            fut, _ = entry
+            if not fut.done():
+                fut.set_result(payload)
+                self._stats["resolved"] += 1
+                return True
+            return False
+        if cid is None or cid not in self._expired:
+            self._stats["unknown"] += 1
+            return False
+        context = self._expired.pop(cid)
+        self._stats["late"] += 1
+        if self._late_policy == "deliver" and self._on_late is not None:
+            self._stats["late_delivered"] += 1
+            task = asyncio.get_running_loop().create_task(self._deliver_late(context, payload))
+            self._late_tasks.add(task)
+            task.add_done_callback(self._late_tasks.discard)
+        else:
+            print(f"[⏰ PendingCalls] Ответ {cid} пришёл после таймаута и отброшен")
+        return False
+
+    async def close(self) -> None:
+        """Остановить тикер и отменить все ожидающие вызовы."""
+        if self._ticker is not None:
+            self._ticker.cancel()
+            await asyncio.gather(self._ticker, return_exceptions=True)
+            self._ticker = None
+        for fut, _ in list(self._calls.values()):
+            fut.cancel()
+        self._calls.clear()
+
+    # ------------------------------------------------------------------
+    # Внутренние методы
+    # ------------------------------------------------------------------
+    def _on_done(self, cid: str, fut: asyncio.Future) -> None:
+        # Вызывающий отменил ожидание (например, отмена задачи хендлера)
+        if fut.cancelled() and self._calls.pop(cid, None) is not None:
+            self._wheel.cancel(cid)
+            self._stats["cancelled"] += 1
+
+    async def _tick(self) -> None:
+        # Одна задача на всю таблицу; завершается, когда ждать нечего
+        while self._wheel:
+            await asyncio.sleep(self._wheel.tick)
+            for cid in self._wheel.advance():
+                self._expire(cid)
+
+    def _expire(self, cid: str) -> None:
+        entry = self._calls.pop(cid, None)
+        if entry is None:
+            return None
+        fut, context = entry
+        if not fut.done():
+            fut.set_exception(asyncio.TimeoutError())
+        self._stats["expired"] += 1
+        self._expired[cid] = context
+        while len(self._expired) > self._late_window:
+            self._expired.popitem(last=False)
+
+    async def _deliver_late(self, context: Any, payload: Dict[str, Any]) -> None:
+        assert self._on_late is not None
+        try:
+            await self._on_late(context, payload)
+        except Exception as exc:  # noqa: BLE001
+            print(f"[⚠️ PendingCalls] Ошибка доставки опоздавшего ответа: {exc!r}")
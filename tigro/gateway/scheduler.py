@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+"""Планировщик исходящих вызовов Telegram API.
+
+Telegram ограничивает частоту запросов глобально (≈30 сообщений/с на бота)
+и на каждый чат. Если вызывать ``message.answer`` / ``edit_text`` напрямую,
+всплески упираются в 429 (``retry_after``) и блокируют хендлер.
+
+Планировщик:
+1) Пропускает все вызовы через глобальный token bucket.
+2) Держит FIFO-очередь на каждый чат – порядок сообщений сохраняется,
+   а между вызовами в одном чате выдерживается пауза (лимит Telegram
+   на чат: ≈1/с в личке, ≈20/мин в группе).
+3) При ошибке с атрибутом ``retry_after`` (aiogram ``TelegramRetryAfter``)
+   приостанавливает bucket и повторяет вызов.
+4) Склеивает ещё не отправленные вызовы с одинаковым ``coalesce_key``:
+   из серии ``edit_message`` одного сообщения уходит только последний.
+5) Массовые вызовы (``bulk=True``, рассылки) дополнительно проходят
+   через свой bucket на долю ``bulk_share`` общего лимита – остаток
+   всегда достаётся интерактивным ответам.
+
+SRP  – модуль отвечает только за темп и порядок исходящих вызовов.
+DIP  – принимает произвольные awaitable-фабрики, не зависит от aiogram.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional
+
+__all__ = ("TokenBucket", "OutboundScheduler")
+
+# Сколько чатов помнить, прежде чем забывать время вызова в давно молчащих
+_LAST_CALL_LIMIT = 10_000
+
+
+class TokenBucket:
+    """Асинхронный token bucket: *rate* токенов в секунду, ёмкость *capacity*."""
+
+    __slots__ = ("_rate", "_capacity", "_tokens", "_updated", "_blocked_until", "_lock")
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate = float(rate)
+        self._capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self._capacity
+        self._updated: Optional[float] = None
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def block(self, seconds: float) -> None:
+        """Запретить выдачу токенов на *seconds* секунд (ответ 429)."""
+        until = asyncio.get_running_loop().time() + seconds
+        self._blocked_until = max(self._blocked_until, until)
+        self._tokens = 0.0
+
+    async def acquire(self) -> None:
+        """Дождаться и забрать один токен."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            while True:
+                now = loop.time()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                if self._updated is not None:
+                    elapsed = now - self._updated
+                    self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return None
+                await asyncio.sleep((1.0 - self._tokens) / self._rate)
+
+
+class _Job:
+    __slots__ = ("call", "waiters", "key", "bulk")
+
+    def __init__(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        waiter: asyncio.Future,
+        key: Optional[Hashable],
+        bulk: bool = False,
+    ) -> None:
+        self.call = call
+        self.waiters: List[asyncio.Future] = [waiter]
+        self.key = key
+        self.bulk = bulk
+
+
+class OutboundScheduler:
+    """Глобальный rate limit + FIFO-очереди по чатам + склейка edit-вызовов."""
+
+    def __init__(
+        self,
+        rate: float = 30.0,
+        burst: Optional[float] = None,
+        per_chat_interval: float = 1.0,
+        group_interval: float = 3.0,
+        max_retries: int = 3,
+        bulk_share: float = 0.5,
+    ) -> None:
+        """
+        rate              – глобальный лимит вызовов в секунду;
+        burst             – ёмкость bucket (по умолчанию = rate);
+        per_chat_interval – минимальная пауза между вызовами в личном чате
+                            (Telegram: ≈1 сообщение в секунду);
+        group_interval    – то же для групп и каналов (chat_id < 0;
+                            Telegram: ≈20 сообщений в минуту);
+        max_retries       – сколько раз повторять вызов после 429;
+        bulk_share        – доля rate, которую могут занять bulk-вызовы.
+        """
+        if not 0 < bulk_share <= 1:
+            raise ValueError("bulk_share must be in (0, 1]")
+        self._bucket = TokenBucket(rate, burst)
+        self._bulk_bucket = TokenBucket(rate * bulk_share, max(1.0, (burst or rate) * bulk_share))
+        self._per_chat_interval = per_chat_interval
+        self._group_interval = group_interval
+        self._last_call: Dict[int, float] = {}
+        self._max_retries = max_retries
+        self._queues: Dict[int, Deque[_Job]] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._coalescable: Dict[Hashable, _Job] = {}
+        self._stats: Dict[str, int] = {
+            "submitted": 0,
+            "sent": 0,
+            "coalesced": 0,
+            "retried": 0,
+            "failed": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Публичный API
+    # ------------------------------------------------------------------
+    @property
+    def bucket(self) -> TokenBucket:
+        return self._bucket
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Счётчики: submitted / sent / coalesced / retried / failed."""
+        return dict(self._stats, queued=sum(len(q) for q in self._queues.values()))
+
+    def submit(
+        self,
+        chat_id: int,
+        call: Callable[[], Awaitable[Any]],
+        coalesce_key: Optional[Hashable] = None,
+        bulk: bool = False,
+    ) -> asyncio.Future:
+        """Поставить вызов в очередь чата. Возвращает future с результатом.
+
+        Если в очереди уже ждёт вызов с тем же *coalesce_key*, он заменяется
+        новым (позиция в очереди сохраняется), а оба future получат
+        результат последнего вызова. *bulk* – вызов рассылки: ограничен
+        долей ``bulk_share`` общего лимита.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._stats["submitted"] += 1
+
+        if coalesce_key is not None:
+            queued = self._coalescable.get(coalesce_key)
+            if queued is not None:
+                queued.call = call
+                queued.waiters.append(waiter)
+                self._stats["coalesced"] += 1
+                return waiter
+
+        job = _Job(call, waiter, coalesce_key, bulk)
+        if coalesce_key is not None:
+            self._coalescable[coalesce_key] = job
+        self._queues.setdefault(chat_id, deque()).append(job)
+        if len(self._last_call) > _LAST_CALL_LIMIT:
+            self._forget_idle_chats(loop.time())
+        if chat_id not in self._workers:
+            self._workers[chat_id] = loop.create_task(self._drain(chat_id))
+        return waiter
+
+    async def close(self) -> None:
+        """Дождаться отправки всего, что уже стоит в очередях."""
+        while self._workers:
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Внутренние методы
+    # ------------------------------------------------------------------
+    def _interval(self, chat_id: int) -> float:
+        return self._group_interval if chat_id < 0 else self._per_chat_interval
+
+    def _forget_idle_chats(self, now: float) -> None:
+        idle = max(self._per_chat_interval, self._group_interval)
+        for chat_id, last in list(self._last_call.items()):
+            if now - last >= idle and chat_id not in self._workers:
+                del self._last_call[chat_id]
+
+    async def _drain(self, chat_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queues[chat_id]
+        interval = self._interval(chat_id)
+        try:
+            while queue:
+                # Пауза считается от предыдущего вызова в чате, даже если
+                # между ними очередь успела опустеть
+                last = self._last_call.get(chat_id)
+                if interval and last is not None:
+                    delay = last + interval - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        continue  # за время паузы вызов могли склеить
+                job = queue.popleft()
+                if job.key is not None and self._coalescable.get(job.key) is job:
+                    del self._coalescable[job.key]
+                await self._execute(chat_id, job)
+                self._last_call[chat_id] = loop.time()
+        finally:
+            self._workers.pop(chat_id, None)
+            if not queue:
+                self._queues.pop(chat_id, None)
+
+    async def _execute(self, chat_id: int, job: _Job) -> None:
+        attempt = 0
+        while True:
+            if job.bulk:
+                await self._bulk_bucket.acquire()
+            await self._bucket.acquire()
+            try:
+                result = await job.call()
+            except Exception as exc:  # noqa: BLE001
+                retry_after = getattr(exc, "retry_after", None)
+                if retry_after is not None and attempt < self._max_retries:
+                    attempt += 1
+                    self._stats["retried"] += 1
+                    print(
+                        f"[⏳ Scheduler] 429 в chat_id={chat_id}: повтор {attempt}/{self._max_retries} "
+                        f"через {retry_after} с"
+                    )
+                    self._bucket.block(float(retry_after))
+                    continue
+                self._stats["failed"] += 1
+                for waiter in job.waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                return None
+            self._stats["sent"] += 1
+            for waiter in job.waiters:
+                if not waiter.done():
+                    waiter.set_result(result)
+            return None
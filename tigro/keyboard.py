@@ -13,6 +13,27 @@ from __future__ import annotations
 Получается словарь, который понимают *renderers*, и который легко
 конвертировать в объекты aiogram или другого фреймворка.
 
+Типизированные callback_data описываются фабрикой CallbackData::
+
+    Order = CallbackData("order", id=int, action=str)
+
+    cb_btn("Купить", Order(id=5, action="buy"))        # "order:5:buy"
+
+    @router.callback(Order.filter(action="buy"))
+    async def buy(ctx):
+        order_id = ctx.match["id"]                      # уже int
+
+``codec="struct"`` упаковывает поля в бинарный вид + base85, а данные
+длиннее 64 байт уходят в серверное TTL-хранилище (в кнопке – ключ).
+
+Длинные списки листаются через Paginator: результат запроса хранится в
+сервисе под коротким курсором, в Telegram уходит только текущая страница::
+
+    products = Paginator("products", button=lambda p: cb_btn(p.title, Product(id=p.id)))
+    products.attach(router)                     # маршрут ◀️ / ▶️
+
+    await products.send(ctx, "Товары:", await db.all_products())
+
 SOLID
 -----
 SRP  – модуль отвечает только за конструирование абстрактных клавиатур.
@@ -22,7 +43,18 @@ ISP  – публичный интерфейс минимален (cb_btn, url_b
 DIP  – остальной код зависит только от словаря, не от конкретного DSL.
 """
 
-from typing import List, Dict, Any, Sequence
+import base64
+import functools
+import hashlib
+import secrets
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Literal, Mapping, Optional, Sequence, Tuple, Type, Union
+
+from tigro.contracts import CallbackStore, Matcher
+from tigro.schemas import TgEvent
 
 __all__ = (
     "cb_btn",
@@ -30,15 +62,24 @@ __all__ = (
     "inline_kb",
     "reply_kb",
     "inline_kb_grid",
+    "CallbackData",
+    "CallbackDataExpired",
+    "MemoryCallbackStore",
+    "Paginator",
 )
 
+# Ограничение Telegram на callback_data
+CALLBACK_DATA_LIMIT = 64
+
 
 # ------------------------------------------------------------------
 # Конструкторы кнопок
 # ------------------------------------------------------------------
 
-def cb_btn(text: str, data: str) -> Dict[str, str]:  # noqa: D401
-    """Создать кнопку callback-data."""
+def cb_btn(text: str, data: Union[str, "CallbackValue"]) -> Dict[str, str]:  # noqa: D401
+    """Создать кнопку callback-data (строка или значение CallbackData)."""
+    if isinstance(data, CallbackValue):
+        data = data.pack()
     return {"text": text, "callback_data": data}
 
 
@@ -148,4 +189,452 @@ def inline_kb_grid(*groups: Any, cols: int | None = None) -> Dict[str, Any]:  #
 
     # row_width = max len first row or cols? we'll set to max local_cols for simplicity
     rw = cols or max(len(r) for r in all_rows) if all_rows else 1
-    return inline_kb(*all_rows, row_width=rw) 
\ No newline at end of file
+    return inline_kb(*all_rows, row_width=rw) 
+
+
+# ------------------------------------------------------------------
+# Типизированные callback_data
+# ------------------------------------------------------------------
+
+FieldType = Type[Union[int, float, bool, str]]
+_FIELD_TYPES = (int, float, bool, str)
+
+
+class CallbackDataExpired(ValueError):
+    """Ключ переполнения не найден в хранилище (истёк TTL или другая реплика)."""
+
+
+class MemoryCallbackStore:
+    """In-memory TTL-хранилище для длинных callback_data.
+
+    Ключ – хэш содержимого, поэтому одинаковые кнопки не плодят записей.
+    Несколько реплик сервиса должны использовать общее хранилище
+    (например, Redis) с тем же интерфейсом put/get.
+    """
+
+    def __init__(self, ttl: float = 86400.0, max_items: int = 100_000, clock: Any = time.monotonic) -> None:
+        self._ttl = ttl
+        self._max_items = max_items
+        self._clock = clock
+        self._items: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, payload: str) -> str:
+        digest = hashlib.blake2b(payload.encode(), digest_size=9).digest()
+        key = base64.urlsafe_b64encode(digest).decode()
+        self._items[key] = (payload, self._clock() + self._ttl)
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_items:
+            self._items.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        payload, expires = item
+        if expires < self._clock():
+            del self._items[key]
+            return None
+        return payload
+
+
+_default_store = MemoryCallbackStore()
+
+
+class CallbackValue(Mapping[str, Any]):
+    """Значение CallbackData: неизменяемый словарь полей + pack()."""
+
+    __slots__ = ("_factory", "_values")
+
+    def __init__(self, factory: "CallbackData", values: Dict[str, Any]) -> None:
+        self._factory = factory
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __iter__(self):  # noqa: ANN204
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def pack(self) -> str:
+        return self._factory.pack(**self._values)
+
+    def __repr__(self) -> str:
+        return f"{self._factory.prefix}{self._values!r}"
+
+
+class CallbackData:
+    """Фабрика типизированных callback_data с префиксом и набором полей.
+
+    Форматы::
+
+        text   – "prefix:5:buy" (строки экранируются);
+        struct – "prefix:" + base85(varint / double / utf-8);
+        overflow – "prefix/<ключ>", если результат длиннее 64 байт.
+    """
+
+    __slots__ = ("_prefix", "_fields", "_codec", "_store", "_decode")
+
+    def __init__(
+        self,
+        prefix: str,
+        *,
+        codec: Literal["text", "struct"] = "text",
+        store: Optional[CallbackStore] = None,
+        cache_size: int = 1024,
+        **fields: FieldType,
+    ) -> None:
+        """
+        fields – имя поля → тип (int, float, bool, str), порядок важен;
+        store  – куда уходят данные длиннее 64 байт (по умолчанию
+                 общее in-memory хранилище процесса).
+        """
+        if not prefix or any(ch in prefix for ch in ":/"):
+            raise ValueError("prefix must be non-empty and must not contain ':' or '/'")
+        if codec not in ("text", "struct"):
+            raise ValueError(f"Unknown codec: {codec!r}")
+        for name, tp in fields.items():
+            if tp not in _FIELD_TYPES:
+                raise TypeError(f"Unsupported field type for {name!r}: {tp!r}")
+        self._prefix = prefix
+        self._fields: Tuple[Tuple[str, FieldType], ...] = tuple(fields.items())
+        self._codec = codec
+        self._store = store if store is not None else _default_store
+        # Кэшируется разбор тела, а не callback_data: ключ переполнения
+        # каждый раз сверяется с хранилищем и после истечения не оживает
+        self._decode = functools.lru_cache(maxsize=cache_size)(self._decode_body)
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    def __call__(self, **values: Any) -> CallbackValue:
+        """Order(id=5, action="buy") → значение для cb_btn."""
+        return CallbackValue(self, self._validate(values))
+
+    # ---------- кодирование ----------
+    def pack(self, **values: Any) -> str:
+        values = self._validate(values)
+        if self._codec == "struct":
+            body = base64.b85encode(self._pack_struct(values)).decode()
+        else:
+            body = ":".join(_escape(_to_text(values[name], tp)) for name, tp in self._fields)
+        data = f"{self._prefix}:{body}"
+        if len(data.encode()) <= CALLBACK_DATA_LIMIT:
+            return data
+        data = f"{self._prefix}/{self._store.put(body)}"
+        if len(data.encode()) > CALLBACK_DATA_LIMIT:
+            raise ValueError("callback_data prefix is too long even for the overflow key")
+        return data
+
+    def unpack(self, data: str) -> CallbackValue:
+        """Разобрать callback_data. ValueError – чужой/повреждённый формат."""
+        if data.startswith(f"{self._prefix}/"):
+            body = self._store.get(data[len(self._prefix) + 1:])
+            if body is None:
+                raise CallbackDataExpired(f"callback_data {data!r} is expired")
+        elif data.startswith(f"{self._prefix}:"):
+            body = data[len(self._prefix) + 1:]
+        else:
+            raise ValueError(f"callback_data {data!r} does not belong to {self._prefix!r}")
+        try:
+            return self._decode(body)
+        except ValueError as exc:
+            raise ValueError(f"Malformed callback_data {data!r}: {exc}") from None
+
+    def matches(self, data: Optional[str]) -> bool:
+        """Принадлежит ли callback_data этой фабрике (без декодирования)."""
+        return bool(data) and data.startswith((f"{self._prefix}:", f"{self._prefix}/"))  # type: ignore[union-attr]
+
+    def filter(self, **conditions: Any) -> "CallbackDataMatcher":
+        """Матчер: префикс совпадает и поля равны *conditions*."""
+        unknown = set(conditions) - {name for name, _ in self._fields}
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}")
+        return CallbackDataMatcher(self, conditions)
+
+    # ---------- внутреннее ----------
+    def _validate(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        names = [name for name, _ in self._fields]
+        if set(values) != set(names):
+            raise ValueError(f"{self._prefix}: expected fields {names}, got {sorted(values)}")
+        result: Dict[str, Any] = {}
+        for name, tp in self._fields:
+            value = values[name]
+            if tp is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            if type(value) is not tp:
+                raise TypeError(f"{self._prefix}.{name} must be {tp.__name__}, got {type(value).__name__}")
+            result[name] = value
+        return result
+
+    def _decode_body(self, body: str) -> CallbackValue:
+        try:
+            if self._codec == "struct":
+                values = self._unpack_struct(base64.b85decode(body))
+            else:
+                parts = body.split(":") if self._fields else []
+                if len(parts) != len(self._fields):
+                    raise ValueError("field count mismatch")
+                values = {name: _from_text(_unescape(part), tp) for (name, tp), part in zip(self._fields, parts)}
+        except (IndexError, struct.error) as exc:
+            raise ValueError(str(exc)) from None
+        return CallbackValue(self, values)
+
+    def _pack_struct(self, values: Dict[str, Any]) -> bytes:
+        out = bytearray()
+        for name, tp in self._fields:
+            value = values[name]
+            if tp is bool:
+                out.append(1 if value else 0)
+            elif tp is int:
+                if not -(2 ** 63) <= value < 2 ** 63:
+                    raise ValueError(f"{self._prefix}.{name} does not fit into 64-bit integer")
+                _write_varint(out, (value << 1) ^ (value >> 63))  # zigzag
+            elif tp is float:
+                out += struct.pack("!d", value)
+            else:
+                raw = value.encode()
+                _write_varint(out, len(raw))
+                out += raw
+        return bytes(out)
+
+    def _unpack_struct(self, raw: bytes) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        pos = 0
+        for name, tp in self._fields:
+            if tp is bool:
+                values[name] = raw[pos] == 1
+                pos += 1
+            elif tp is int:
+                zz, pos = _read_varint(raw, pos)
+                values[name] = (zz >> 1) ^ -(zz & 1)
+            elif tp is float:
+                (values[name],) = struct.unpack_from("!d", raw, pos)
+                pos += 8
+            else:
+                size, pos = _read_varint(raw, pos)
+                if pos + size > len(raw):
+                    raise ValueError("truncated string")
+                values[name] = raw[pos:pos + size].decode()
+                pos += size
+        if pos != len(raw):
+            raise ValueError("trailing bytes")
+        return values
+
+
+class CallbackDataMatcher(Matcher):
+    """Матчер CallbackData: префикс + равенство указанных полей.
+
+    Разобранные поля Router передаёт хендлеру через ``ctx.match``.
+    """
+
+    __slots__ = ("_factory", "_conditions")
+
+    def __init__(self, factory: CallbackData, conditions: Dict[str, Any]) -> None:
+        self._factory = factory
+        self._conditions = conditions
+
+    def captures(self, event: TgEvent) -> Optional[Dict[str, Any]]:
+        data = event.callback_data
+        if not self._factory.matches(data):
+            return None
+        try:
+            value = self._factory.unpack(data)  # type: ignore[arg-type]
+        except ValueError as exc:
+            print(f"[⚠️ CallbackData] {exc}")
+            return None
+        if any(value[k] != v for k, v in self._conditions.items()):
+            return None
+        return dict(value)
+
+    def match(self, event: TgEvent) -> bool:
+        return self.captures(event) is not None
+
+    def __repr__(self) -> str:
+        return f"<CallbackData {self._factory.prefix} {self._conditions}>"
+
+
+# ------------------------------------------------------------------
+# Постраничные клавиатуры
+# ------------------------------------------------------------------
+
+@dataclass
+class _Cursor:
+    items: Sequence[Any]
+    text: str
+    parse_mode: str
+    expires: float
+
+
+class Paginator:
+    """Постраничная inline-клавиатура с серверным курсором.
+
+    Список (результат запроса) сохраняется в LRU/TTL-кэше сервиса под
+    коротким ключом; кнопки строятся только для видимой страницы.
+    Кнопки навигации несут ``<name>:<cursor>:<page>``, маршрут из
+    ``attach`` перерисовывает страницу через ``edit_message`` без
+    повторного запроса к базе.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        button: Callable[[Any], Dict[str, Any]] = lambda item: item,
+        per_page: int = 10,
+        cols: int = 1,
+        ttl: float = 3600.0,
+        max_cursors: int = 10_000,
+        expired_text: str = "⌛ Список устарел, запросите его заново",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        button      – элемент списка → кнопка (cb_btn/url_btn);
+        per_page    – элементов на странице, cols – кнопок в ряду;
+        ttl         – сколько секунд курсор живёт после последнего обращения;
+        max_cursors – сколько списков хранится одновременно (LRU).
+        """
+        if per_page < 1 or cols < 1:
+            raise ValueError("per_page and cols must be positive")
+        self._nav = CallbackData(name, cursor=str, page=int)
+        self._button = button
+        self._per_page = per_page
+        self._cols = cols
+        self._ttl = ttl
+        self._max_cursors = max_cursors
+        self._expired_text = expired_text
+        self._clock = clock
+        self._cursors: "OrderedDict[str, _Cursor]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def pages(self, cursor: str) -> int:
+        """Количество страниц списка (0 – курсор истёк)."""
+        entry = self._lookup(cursor)
+        return self._page_count(entry.items) if entry is not None else 0
+
+    def open(self, items: Sequence[Any], text: str = "", *, parse_mode: str = "") -> str:
+        """Сохранить список и вернуть курсор."""
+        cursor = secrets.token_urlsafe(6)
+        self._cursors[cursor] = _Cursor(items, text, parse_mode, self._clock() + self._ttl)
+        while len(self._cursors) > self._max_cursors:
+            self._cursors.popitem(last=False)
+        return cursor
+
+    def page(self, cursor: str, page: int = 0) -> Optional[Dict[str, Any]]:
+        """Клавиатура страницы *page*; None – курсор истёк."""
+        entry = self._lookup(cursor)
+        if entry is None:
+            return None
+        return self._render(cursor, entry, page)
+
+    async def send(self, ctx: Any, text: str, items: Sequence[Any], *, parse_mode: str = "", **kwargs: Any) -> str:
+        """Отправить первую страницу *items* с текстом *text*; вернуть курсор."""
+        cursor = self.open(items, text, parse_mode=parse_mode)
+        await ctx.send_message(text, parse_mode=parse_mode, markup=self.page(cursor), **kwargs)
+        return cursor
+
+    def attach(self, router: Any) -> None:
+        """Зарегистрировать в *router* маршрут кнопок навигации."""
+        router.register(self._nav.filter(), self._navigate)
+
+    # ---------- внутреннее ----------
+    async def _navigate(self, ctx: Any) -> None:
+        cursor, page = ctx.match["cursor"], ctx.match["page"]
+        entry = self._lookup(cursor)
+        if entry is None:
+            await ctx.answer_callback(self._expired_text)
+            return None
+        await ctx.edit_message(entry.text, parse_mode=entry.parse_mode, markup=self._render(cursor, entry, page))
+        return None
+
+    def _lookup(self, cursor: str) -> Optional[_Cursor]:
+        entry = self._cursors.get(cursor)
+        if entry is None:
+            return None
+        now = self._clock()
+        if entry.expires < now:
+            del self._cursors[cursor]
+            return None
+        entry.expires = now + self._ttl
+        self._cursors.move_to_end(cursor)
+        return entry
+
+    def _page_count(self, items: Sequence[Any]) -> int:
+        return max(1, -(-len(items) // self._per_page))
+
+    def _render(self, cursor: str, entry: _Cursor, page: int) -> Dict[str, Any]:
+        total = self._page_count(entry.items)
+        page = max(0, min(page, total - 1))
+        start = page * self._per_page
+        buttons = [self._button(item) for item in entry.items[start:start + self._per_page]]
+        rows = [buttons[i:i + self._cols] for i in range(0, len(buttons), self._cols)]
+        if total > 1:
+            nav: List[Dict[str, Any]] = []
+            if page > 0:
+                nav.append(cb_btn("◀️", self._nav(cursor=cursor, page=page - 1)))
+            nav.append(cb_btn(f"{page + 1}/{total}", self._nav(cursor=cursor, page=page)))
+            if page < total - 1:
+                nav.append(cb_btn("▶️", self._nav(cursor=cursor, page=page + 1)))
+            rows.append(nav)
+        return inline_kb(*rows)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return None
+
+
+def _read_varint(raw: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = raw[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _to_text(value: Any, tp: FieldType) -> str:
+    if tp is bool:
+        return "1" if value else "0"
+    if tp is float:
+        return repr(value)
+    return str(value)
+
+
+def _from_text(text: str, tp: FieldType) -> Any:
+    if tp is bool:
+        if text not in ("0", "1"):
+            raise ValueError(f"bad bool {text!r}")
+        return text == "1"
+    return tp(text)
+
+
+def _escape(text: str) -> str:
+    return text.replace("%", "%25").replace(":", "%3A")
+
+
+def _unescape(text: str) -> str:
+    return text.replace("%3A", ":").replace("%25", "%")
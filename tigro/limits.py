@@ -0,0 +1,113 @@
+"""
+Ограничение конкурентности отдельных хендлеров (bulkhead).
+
+Медленный хендлер (отчёт поверх медленного API) не должен занимать все
+слоты сервиса и задерживать быстрые `/start`. Для хендлера можно задать::
+
+    @router.command("/report", max_concurrency=2, queue_limit=10,
+                    busy_text="Отчёты сейчас формируются, попробуйте позже")
+    async def report(ctx): ...
+
+Одновременно выполняется не больше ``max_concurrency`` вызовов, ещё
+``queue_limit`` ждут своей очереди, а остальным событиям сразу уходит
+ответ «занято» – без бесконечного ожидания.
+
+SRP  – модуль только решает, пропустить ли вызов хендлера.
+OCP  – лимиты навешиваются обёрткой, сам хендлер не меняется.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from tigro.contracts import Handler
+
+if TYPE_CHECKING:  # pragma: no cover
+    from tigro.core import Context
+
+__all__ = ("HandlerLimits", "Bulkhead", "DEFAULT_BUSY_TEXT")
+
+DEFAULT_BUSY_TEXT = "⏳ Сервис занят, попробуйте чуть позже."
+
+
+@dataclass(frozen=True)
+class HandlerLimits:
+    """Лимиты хендлера: max_concurrency выполняются, queue_limit ждут."""
+
+    max_concurrency: int
+    queue_limit: int = 0
+    busy_text: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if self.queue_limit < 0:
+            raise ValueError("queue_limit must be >= 0")
+
+    @classmethod
+    def build(
+        cls,
+        max_concurrency: Optional[int] = None,
+        queue_limit: Optional[int] = None,
+        busy_text: Optional[str] = None,
+    ) -> Optional["HandlerLimits"]:
+        """Лимиты из аргументов декоратора; None – если лимит не задан."""
+        if max_concurrency is None:
+            if queue_limit is not None or busy_text is not None:
+                raise ValueError("queue_limit/busy_text require max_concurrency")
+            return None
+        return cls(max_concurrency, queue_limit or 0, busy_text)
+
+
+class Bulkhead:
+    """Обёртка хендлера с семафором и ограниченной очередью ожидания."""
+
+    def __init__(self, handler: Handler, limits: HandlerLimits) -> None:
+        self._handler = handler
+        self._limits = limits
+        self._semaphore = asyncio.Semaphore(limits.max_concurrency)
+        self._running = 0
+        self._waiting = 0
+        self._rejected = 0
+        self.__name__ = getattr(handler, "__name__", repr(handler))
+
+    @property
+    def handler(self) -> Handler:
+        return self._handler
+
+    @property
+    def limits(self) -> HandlerLimits:
+        return self._limits
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {"running": self._running, "waiting": self._waiting, "rejected": self._rejected}
+
+    async def __call__(self, ctx: "Context") -> None:
+        if self._running >= self._limits.max_concurrency and self._waiting >= self._limits.queue_limit:
+            self._rejected += 1
+            print(f"[🚧 Bulkhead] {self.__name__}: занято (running={self._running}, waiting={self._waiting})")
+            await self._reply_busy(ctx)
+            return None
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        try:
+            await self._handler(ctx)
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+
+    async def _reply_busy(self, ctx: "Context") -> None:
+        text = self._limits.busy_text or DEFAULT_BUSY_TEXT
+        if ctx.event.event_type == "callback":
+            await ctx.answer_callback(text)
+        else:
+            await ctx.send_message(text)
+
+    def __repr__(self) -> str:
+        return f"<bulkhead {self.__name__} {self._limits}>"
@@ -1,13 +1,22 @@
 """
 Набор базовых матчеров (Command / Callback / Predicate).
 Можно писать свои, наследуясь от Matcher.
+
+Текстовые матчеры (Text / StartsWith / Regex / CommandArgs) Router не
+перебирает по одному: все они компилируются в одну альтернацию
+(TextAutomaton), и один проход regex-движка находит первый подходящий
+маршрут. Именованные группы доступны хендлеру через ``ctx.match``.
 """
+import functools
+import re
 from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 from tigro.contracts import Matcher
 from tigro.schemas import TgEvent
 
+Groups = Dict[str, Optional[str]]
+
 
 @dataclass(slots=True)
 class Command(Matcher):
@@ -39,3 +48,148 @@ class Predicate(Matcher):
 
     def match(self, event: TgEvent) -> bool:  # noqa: D401
         return self._fn(event)
+
+
+# ------------------------------------------------------------------
+# Текстовые матчеры
+# ------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=512)
+def _compile(source: str, ignore_case: bool) -> "re.Pattern[str]":
+    return re.compile(source, re.IGNORECASE if ignore_case else 0)
+
+
+class TextPattern(Matcher):
+    """База текстовых матчеров.
+
+    ``source()`` возвращает regex, который применяется через ``re.match``
+    (привязан к началу текста) – так его можно включить в общую
+    альтернацию маршрутов.
+    """
+
+    __slots__ = ()
+    ignore_case: bool
+
+    def source(self) -> str:
+        raise NotImplementedError
+
+    def search(self, text: Optional[str]) -> Optional[Groups]:
+        """Именованные группы при совпадении, иначе None."""
+        if text is None:
+            return None
+        found = _compile(self.source(), self.ignore_case).match(text)
+        return found.groupdict() if found else None
+
+    def captures(self, event: TgEvent) -> Optional[Groups]:
+        return self.search(event.text)
+
+    def match(self, event: TgEvent) -> bool:
+        return self.search(event.text) is not None
+
+
+@dataclass(slots=True)
+class Text(TextPattern):
+    """Точное совпадение текста (опционально без учёта регистра)."""
+
+    value: str
+    ignore_case: bool = False
+
+    def source(self) -> str:
+        return rf"{re.escape(self.value)}\Z"
+
+
+@dataclass(slots=True)
+class StartsWith(TextPattern):
+    """Текст начинается с *prefix*."""
+
+    prefix: str
+    ignore_case: bool = False
+
+    def source(self) -> str:
+        return re.escape(self.prefix)
+
+
+@dataclass(slots=True)
+class Regex(TextPattern):
+    """Регулярное выражение в любом месте текста (семантика ``re.search``)."""
+
+    pattern: str
+    ignore_case: bool = False
+
+    def source(self) -> str:
+        return rf"(?s:.*?)(?:{self.pattern})"
+
+
+@dataclass(slots=True)
+class CommandArgs(TextPattern):
+    """Команда с аргументами: ``CommandArgs("/buy", r"(?P<qty>\\d+)")``.
+
+    Допускает суффикс ``@botname``. Аргументы обязательны: «/buy» без
+    них достанется следующим маршрутам (например, ``Command("/buy")``).
+    """
+
+    command: str
+    args: str = r"(?P<args>.+)"
+    ignore_case: bool = False
+
+    def source(self) -> str:
+        return rf"{re.escape(self.command)}(?:@\w+)?\s+(?:{self.args})\s*\Z"
+
+
+_GROUP = re.compile(r"\(\?P<(\w+)>")
+_BACKREF = re.compile(r"\(\?P=(\w+)\)")
+_NUMBERED_BACKREF = re.compile(r"\\[1-9]")
+
+
+class TextAutomaton:
+    """Все текстовые маршруты Router-а в одной альтернации.
+
+    Ветка маршрута *idx* – группа ``_r{idx}``; его именованные группы
+    переименованы в ``_r{idx}_<name>``, а флаг регистра ограничен веткой
+    (``(?i:...)``). Python пробует альтернативы слева направо, поэтому
+    выигрывает первый зарегистрированный маршрут.
+    """
+
+    __slots__ = ("_regex", "_groups", "_covered")
+
+    def __init__(self, routes: Sequence[Tuple[int, TextPattern]]) -> None:
+        branches: List[str] = []
+        self._groups: Dict[int, List[Tuple[str, str]]] = {}
+        for idx, matcher in routes:
+            source = matcher.source()
+            if _NUMBERED_BACKREF.search(source):
+                continue  # номера групп сдвинутся – маршрут проверяется отдельно
+            prefix = f"_r{idx}_"
+            renamed = _GROUP.sub(lambda m: f"(?P<{prefix}{m.group(1)}>", source)
+            renamed = _BACKREF.sub(lambda m: f"(?P={prefix}{m.group(1)})", renamed)
+            flags = "i" if matcher.ignore_case else ""
+            branch = f"(?P<_r{idx}>(?{flags}:{renamed}))"
+            try:
+                # Глобальные inline-флаги ((?s) и т.п.) внутри ветки недопустимы
+                names = list(re.compile(source).groupindex)
+                re.compile(branch)
+            except re.error:
+                continue
+            branches.append(branch)
+            self._groups[idx] = [(name, prefix + name) for name in names]
+        try:
+            self._regex = re.compile("|".join(branches)) if branches else None
+        except re.error as exc:
+            print(f"[⚠️ TextAutomaton] Не удалось скомпилировать общий regex: {exc}")
+            self._regex = None
+            self._groups = {}
+        self._covered = frozenset(self._groups)
+
+    def covers(self, idx: int) -> bool:
+        """Проверяется ли маршрут *idx* общим regex."""
+        return idx in self._covered
+
+    def scan(self, text: Optional[str]) -> Optional[Tuple[int, Groups]]:
+        """Первый совпавший маршрут и его именованные группы."""
+        if self._regex is None or text is None:
+            return None
+        found = self._regex.match(text)
+        if found is None or found.lastgroup is None:
+            return None
+        idx = int(found.lastgroup[2:])
+        return idx, {name: found.group(alias) for name, alias in self._groups[idx]}
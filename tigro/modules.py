@@ -29,12 +29,14 @@ ISP  – публичный интерфейс максимально узкий
 DIP  – логика объединения вынесена в функцию, Router остаётся неизменным.
 """
 
-from typing import List, Tuple, Callable, Awaitable, TypeVar
+from typing import Any, Dict, List, Optional, Tuple, Callable, Awaitable, TypeVar
 
 from tigro.core import Router
 from tigro.contracts import Matcher, Handler, ResponsePublisher
 from tigro.matchers import Command as _Command, Callback as _Callback, Predicate as _Predicate
+from tigro.matchers import CommandArgs as _CommandArgs, Regex as _Regex, StartsWith as _StartsWith, Text as _Text
 from tigro.core import Context
+from tigro.limits import HandlerLimits
 
 __all__ = ("ModuleRouter", "include_router")
 
@@ -55,35 +57,59 @@ class ModuleRouter(Router):
 
     # ------------------------------------------------------------------
     # Декораторы в стиле FastAPI / Aiogram
+    #
+    # **limits – лимиты хендлера (max_concurrency / queue_limit / busy_text,
+    # см. tigro.limits); лишние события сразу получают *busy_text*.
     # ------------------------------------------------------------------
-    def command(self, cmd: str) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:  # noqa: D401
+    def command(self, cmd: str, **limits: Any) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:  # noqa: D401
         """@router.command("/start")"""
+        return self._decorate(_Command(cmd), limits)
 
-        def decorator(func: Callable[[Context], Awaitable[None]]) -> Callable[[Context], Awaitable[None]]:
-            self.register(_Command(cmd), func)
-            return func
-
-        return decorator
-
-    def callback(self, data: str) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:  # noqa: D401
-        """@router.callback("confirm_email")"""
+    def callback(self, data: str | Matcher, **limits: Any) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:  # noqa: D401
+        """@router.callback("confirm_email") или @router.callback(Order.filter(action="buy"))"""
+        matcher = data if isinstance(data, Matcher) else _Callback(data)
+        return self._decorate(matcher, limits)
 
-        def decorator(func: Callable[[Context], Awaitable[None]]) -> Callable[[Context], Awaitable[None]]:
-            self.register(_Callback(data), func)
-            return func
-
-        return decorator
-
-    def message(self, predicate: Callable[["TgEvent"], bool]) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:  # noqa: D401
+    def message(self, predicate: Callable[["TgEvent"], bool], **limits: Any) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:  # noqa: D401
         """@router.message(lambda ev: ev.text.isdigit())"""
+        return self._decorate(_Predicate(predicate), limits)
+
+    def text(
+        self,
+        value: str,
+        *,
+        ignore_case: bool = False,
+        prefix: bool = False,
+        **limits: Any,
+    ) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:  # noqa: D401
+        """@router.text("привет", ignore_case=True); prefix=True – «начинается с»."""
+        matcher = _StartsWith(value, ignore_case) if prefix else _Text(value, ignore_case)
+        return self._decorate(matcher, limits)
+
+    def regex(
+        self,
+        pattern: str,
+        *,
+        ignore_case: bool = False,
+        **limits: Any,
+    ) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:  # noqa: D401
+        """@router.regex(r"заказ (?P<order>\\d+)") – группы доступны в ctx.match."""
+        return self._decorate(_Regex(pattern, ignore_case), limits)
+
+    def command_args(self, cmd: str, args: str = r"(?P<args>.+)", **limits: Any) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:  # noqa: D401
+        """@router.command_args("/buy", r"(?P<qty>\\d+)") – «/buy 5» → ctx.match["qty"]."""
+        return self._decorate(_CommandArgs(cmd, args), limits)
+
+    def _decorate(self, matcher: Matcher, limits: Dict[str, Any]) -> Callable[[Callable[[Context], Awaitable[None]]], Callable[[Context], Awaitable[None]]]:
+        """Декоратор, регистрирующий хендлер с *matcher* и лимитами (аргументы HandlerLimits.build)."""
+        handler_limits = HandlerLimits.build(**limits)
 
         def decorator(func: Callable[[Context], Awaitable[None]]) -> Callable[[Context], Awaitable[None]]:
-            self.register(_Predicate(predicate), func)
+            self.register(matcher, func, handler_limits)
             return func
 
         return decorator
 
-
 # ------------------------------------------------------------------
 # Функция объединения роутеров
 # ------------------------------------------------------------------
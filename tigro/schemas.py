@@ -2,7 +2,7 @@
 """Pydantic-схемы событий и ответов Telegram."""
 
 from pydantic import BaseModel
-from typing import Optional, Literal, Dict, Any
+from typing import Optional, Literal, Dict, Any, List
 
 class TgEvent(BaseModel):
     user_id: int
@@ -14,13 +14,61 @@ class TgEvent(BaseModel):
     event_type: Literal["message", "callback", "command"]
     metadata: Optional[Dict[str, Any]] = {}
     correlation_id: Optional[str] = None
+    bot_id: Optional[int] = None
+    priority: Optional[Literal["interactive", "normal", "bulk"]] = None
+
+class MediaRef(BaseModel):
+    """Ссылка на медиа: стабильный ключ и/или путь в общем хранилище / URL.
+
+    Байты через брокер не передаются: gateway загружает файл один раз
+    и дальше переиспользует file_id из кэша по ключу.
+    """
+
+    type: Literal["photo", "document", "video", "audio", "animation"] = "photo"
+    key: Optional[str] = None
+    path: Optional[str] = None
+    url: Optional[str] = None
+    caption: Optional[str] = None
+
 
 class TgResponse(BaseModel):
-    action: Literal["send_message", "edit_message", "answer_callback", "none"]
+    action: Literal[
+        "send_message",
+        "edit_message",
+        "answer_callback",
+        "send_photo",
+        "send_document",
+        "send_media_group",
+        "none",
+    ]
     text: Optional[str] = None
     next_state: Optional[str] = None
     markup: Optional[Dict[str, Any]] = None
     metadata: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     correlation_id: Optional[str] = None
-    parse_mode: Optional[str] = None 
\ No newline at end of file
+    parse_mode: Optional[str] = None
+    media: Optional[List[MediaRef]] = None
+    bot_id: Optional[int] = None
+
+
+class BroadcastFrame(BaseModel):
+    """Кадр рассылки: start (payload) → chunk (id чатов + payload) → end."""
+
+    broadcast_id: str
+    kind: Literal["start", "chunk", "end"]
+    seq: int = 0
+    payload: Optional[TgResponse] = None
+    chat_ids: List[int] = []
+    total_chunks: Optional[int] = None
+
+
+class BroadcastProgress(BaseModel):
+    """Прогресс рассылки, публикуемый gateway в `event.broadcast.progress`."""
+
+    broadcast_id: str
+    sent: int = 0
+    failed: int = 0
+    chunks_done: int = 0
+    total_chunks: Optional[int] = None
+    finished: bool = False
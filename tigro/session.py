@@ -0,0 +1,235 @@
+"""
+Пользовательские сессии: ``ctx.session``.
+
+Хендлеры и middlewares часто загружают профиль/настройки пользователя
+по нескольку раз на событие. SessionManager держит сессии в
+ограниченном LRU-кэше процесса между событиями, склеивает параллельные
+загрузки одного пользователя в один запрос и записывает сессию обратно
+только если её изменили::
+
+    sessions = SessionManager(MyDbSessionStore(pool), max_size=50_000)
+    router = Router(publisher=publisher, session_manager=sessions)
+
+    @command("/lang")
+    async def lang(ctx):
+        session = await ctx.session          # загрузка при первом обращении
+        session["lang"] = "en"               # запись после хендлера
+
+Router выдаёт сессию событию через checkout(): пока хендлер не завершился
+и сессия не записана, параллельные события того же пользователя ждут
+её, а не видят чужие незаписанные изменения. Если хендлер упал, его
+изменения отбрасываются (release(discard=True)).
+
+Вложенные изменения (``session["cart"].append(...)``) не отслеживаются –
+после них нужно вызвать ``session.mark_dirty()``. Кэш процесса не знает
+об изменениях из других реплик: для них задайте *ttl*.
+
+SRP  – модуль только кэширует и синхронизирует сессии с хранилищем.
+DIP  – хранилище подключается через протокол SessionStore.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, MutableMapping, Optional, Tuple
+
+from tigro.contracts import SessionStore
+
+__all__ = ("Session", "SessionManager", "MemorySessionStore")
+
+
+class Session(MutableMapping[str, Any]):
+    """Словарь данных пользователя с флагом изменения."""
+
+    __slots__ = ("user_id", "_data", "_dirty")
+
+    def __init__(self, user_id: int, data: Optional[Dict[str, Any]] = None) -> None:
+        self.user_id = user_id
+        self._data: Dict[str, Any] = data if data is not None else {}
+        self._dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def mark_dirty(self) -> None:
+        """Отметить вложенное изменение, которое не видно через []."""
+        self._dirty = True
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._data and self._data[key] == value:
+            return None
+        self._data[key] = value
+        self._dirty = True
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+        self._dirty = True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"Session({self.user_id}, {self._data!r}{', dirty' if self._dirty else ''})"
+
+
+class MemorySessionStore:
+    """In-memory SessionStore для тестов и локального запуска.
+
+    Хранит копии, как настоящая БД: изменения сессии не видны без save.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[int, Dict[str, Any]] = {}
+        self.loads = 0
+        self.saves = 0
+
+    async def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        self.loads += 1
+        data = self._data.get(user_id)
+        return copy.deepcopy(data) if data is not None else None
+
+    async def save(self, user_id: int, data: Dict[str, Any]) -> None:
+        self.saves += 1
+        self._data[user_id] = copy.deepcopy(data)
+
+
+class SessionManager:
+    """LRU-кэш сессий поверх SessionStore с коалесцированием загрузок."""
+
+    def __init__(
+        self,
+        store: SessionStore,
+        max_size: int = 10_000,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        max_size – сколько сессий держать в памяти процесса;
+        ttl      – через сколько секунд перечитывать сессию из хранилища
+                   (None – пока не вытеснена из LRU).
+        """
+        self._store = store
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._cache: "OrderedDict[int, Tuple[Session, float]]" = OrderedDict()
+        self._loading: Dict[int, asyncio.Future[Session]] = {}
+        # Блокировки checkout(): lock и число событий, которые его держат или ждут
+        self._locks: Dict[int, Tuple[asyncio.Lock, int]] = {}
+        self._stats: Dict[str, int] = {"hits": 0, "loads": 0, "coalesced": 0, "saves": 0}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, cached=len(self._cache))
+
+    async def get(self, user_id: int) -> Session:
+        """Сессия пользователя: из кэша, из идущей загрузки или из хранилища."""
+        session = self._cached(user_id)
+        if session is not None:
+            self._stats["hits"] += 1
+            return session
+        pending = self._loading.get(user_id)
+        if pending is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        fut: asyncio.Future[Session] = asyncio.get_running_loop().create_future()
+        self._loading[user_id] = fut
+        self._stats["loads"] += 1
+        try:
+            data = await self._store.load(user_id)
+        except BaseException as exc:
+            if isinstance(exc, Exception):
+                fut.set_exception(exc)
+                fut.exception()  # ошибку получат ожидающие; без них – не логировать
+            else:
+                fut.cancel()
+            raise
+        finally:
+            self._loading.pop(user_id, None)
+        session = Session(user_id, data)
+        self._remember(session)
+        fut.set_result(session)
+        return session
+
+    async def checkout(self, user_id: int) -> Session:
+        """Сессия в монопольное пользование одного события.
+
+        Следующий checkout того же пользователя ждёт release(); так
+        незаписанные изменения одного хендлера не видны другому.
+        """
+        lock, users = self._locks.get(user_id) or (asyncio.Lock(), 0)
+        self._locks[user_id] = (lock, users + 1)
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._unref(user_id)
+            raise
+        try:
+            return await self.get(user_id)
+        except BaseException:
+            self.release(user_id)
+            raise
+
+    def release(self, user_id: int, discard: bool = False) -> None:
+        """Вернуть сессию после checkout(). *discard* – хендлер упал:
+        его изменения забываются, следующий checkout перечитает сессию."""
+        if discard:
+            self.invalidate(user_id)
+        self._locks[user_id][0].release()
+        self._unref(user_id)
+
+    async def save(self, session: Session) -> bool:
+        """Записать сессию, если она изменена. True – запись была."""
+        if not session.dirty:
+            return False
+        session._dirty = False
+        try:
+            await self._store.save(session.user_id, dict(session))
+        except BaseException:
+            session._dirty = True
+            raise
+        self._stats["saves"] += 1
+        return True
+
+    def invalidate(self, user_id: int) -> None:
+        """Забыть закэшированную сессию (например, её изменили извне)."""
+        self._cache.pop(user_id, None)
+
+    # ---------- внутреннее ----------
+    def _unref(self, user_id: int) -> None:
+        lock, users = self._locks[user_id]
+        if users > 1:
+            self._locks[user_id] = (lock, users - 1)
+        else:
+            del self._locks[user_id]
+
+    def _cached(self, user_id: int) -> Optional[Session]:
+        item = self._cache.get(user_id)
+        if item is None:
+            return None
+        session, expires = item
+        if expires < self._clock() and not session.dirty:
+            del self._cache[user_id]
+            return None
+        self._cache.move_to_end(user_id)
+        return session
+
+    def _remember(self, session: Session) -> None:
+        expires = self._clock() + self._ttl if self._ttl is not None else float("inf")
+        self._cache[session.user_id] = (session, expires)
+        self._cache.move_to_end(session.user_id)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
@@ -3,5 +3,15 @@
 Сейчас есть RabbitMQ (FastStream). Легко добавить Kafka, RedisStreams...
 """
 from tigro.transport.rabbit_bus import RabbitPublisher  # noqa: F401
+from tigro.transport.pool import PooledPublisher, rabbit_channel_factory  # noqa: F401
+from tigro.transport.subscriber import AdaptiveSubscriber, PrefetchTuner  # noqa: F401
+from tigro.transport.lanes import LaneScheduler  # noqa: F401
 
-__all__ = ("RabbitPublisher",)
+__all__ = (
+    "RabbitPublisher",
+    "PooledPublisher",
+    "rabbit_channel_factory",
+    "AdaptiveSubscriber",
+    "PrefetchTuner",
+    "LaneScheduler",
+)
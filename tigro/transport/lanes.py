@@ -0,0 +1,124 @@
+"""
+Взвешенный планировщик полос (lanes) для подписчика сервиса.
+
+Интерактивные события (callback-и, команды) и фоновые/массовые приходят
+из разных очередей. Планировщик ограничивает общую конкурентность и
+выбирает следующее событие smooth weighted round-robin (как в nginx):
+при очереди в обеих полосах интерактивная получает долю по весу.
+Кроме того, ``reserve`` слотов доступны только самой весомой полосе –
+даже если bulk-полоса завалена работой, клики не ждут освобождения слота.
+
+SRP  – модуль только решает, какую работу запускать следующей.
+DIP  – работа передаётся как фабрика корутины; о брокере модуль не знает.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set
+
+__all__ = ("LaneScheduler",)
+
+Job = Callable[[], Awaitable[None]]
+
+
+class LaneScheduler:
+    """Запускает работу из нескольких полос с учётом весов и резерва."""
+
+    def __init__(
+        self,
+        weights: Dict[str, int],
+        max_concurrency: Optional[int] = None,
+        reserve: int = 1,
+    ) -> None:
+        """
+        weights         – вес каждой полосы (больше – приоритетнее);
+        max_concurrency – общий лимит одновременно выполняемой работы
+                          (None – без ограничений);
+        reserve         – сколько слотов держать только для главной полосы.
+        """
+        if not weights or any(w <= 0 for w in weights.values()):
+            raise ValueError("weights must be positive")
+        self._weights = dict(weights)
+        self._primary = max(self._weights, key=self._weights.__getitem__)
+        self._queues: Dict[str, Deque[Job]] = {lane: deque() for lane in weights}
+        self._current: Dict[str, int] = {lane: 0 for lane in weights}
+        self._running: Dict[str, int] = {lane: 0 for lane in weights}
+        self._tasks: Set[asyncio.Task] = set()
+        self._reserve = reserve
+        self.max_concurrency = max_concurrency
+        self._stats: Dict[str, Dict[str, int]] = {lane: {"started": 0} for lane in weights}
+
+    # ------------------------------------------------------------------
+    # Публичный API
+    # ------------------------------------------------------------------
+    @property
+    def primary(self) -> str:
+        return self._primary
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            lane: dict(self._stats[lane], queued=len(self._queues[lane]), running=self._running[lane])
+            for lane in self._weights
+        }
+
+    def submit(self, lane: str, job: Job) -> None:
+        """Поставить работу в полосу *lane*."""
+        self._queues[lane].append(job)
+        self._pump()
+
+    async def join(self, timeout: Optional[float] = None) -> None:
+        """Дождаться выполнения всей поставленной работы."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while self._tasks:
+            left = None if deadline is None else deadline - loop.time()
+            if left is not None and left <= 0:
+                return None
+            await asyncio.wait(set(self._tasks), timeout=left)
+
+    # ------------------------------------------------------------------
+    # Внутренние методы
+    # ------------------------------------------------------------------
+    def _eligible(self, lane: str, running: int) -> bool:
+        if not self._queues[lane]:
+            return False
+        if self.max_concurrency is None:
+            return True
+        if running >= self.max_concurrency:
+            return False
+        if lane == self._primary or len(self._weights) == 1:
+            return True
+        # Не-главные полосы не занимают зарезервированные слоты
+        return running < self.max_concurrency - self._reserve
+
+    def _pick(self) -> Optional[str]:
+        running = sum(self._running.values())
+        eligible = [lane for lane in self._weights if self._eligible(lane, running)]
+        if not eligible:
+            return None
+        total = sum(self._weights[lane] for lane in eligible)
+        for lane in eligible:
+            self._current[lane] += self._weights[lane]
+        best = max(eligible, key=self._current.__getitem__)
+        self._current[best] -= total
+        return best
+
+    def _pump(self) -> None:
+        while True:
+            lane = self._pick()
+            if lane is None:
+                return None
+            job = self._queues[lane].popleft()
+            self._running[lane] += 1
+            self._stats[lane]["started"] += 1
+            task = asyncio.get_running_loop().create_task(job())
+            self._tasks.add(task)
+            task.add_done_callback(lambda t, lane=lane: self._done(t, lane))
+
+    def _done(self, task: asyncio.Task, lane: str) -> None:
+        self._tasks.discard(task)
+        self._running[lane] -= 1
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[⚠️ Lanes] Ошибка в полосе {lane}: {task.exception()!r}")
+        self._pump()
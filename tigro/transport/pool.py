@@ -0,0 +1,177 @@
+"""
+Пул каналов и конвейерная публикация с пакетными подтверждениями.
+
+`RabbitBroker.publish` ждёт publisher confirm на каждое сообщение через
+один канал, поэтому пропускная способность упирается в round trip.
+PooledPublisher держит несколько каналов одного соединения; каждый
+воркер забирает из очереди пачку сообщений, публикует её подряд и
+ждёт подтверждения всей пачки разом.
+
+SRP  – модуль отвечает только за доставку сообщений в брокер.
+DIP  – пул работает с протоколом PublishChannel; RabbitMQ-реализация
+       (aio-pika поверх соединения FastStream) подключается фабрикой.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Tuple
+
+__all__ = ("PublishChannel", "PooledPublisher", "rabbit_channel_factory")
+
+
+class PublishChannel(Protocol):
+    """Канал, в который можно опубликовать сообщение и дождаться confirm."""
+
+    async def publish(self, message: Any, routing_key: str) -> Any: ...
+
+
+_Item = Tuple[Any, str, "asyncio.Future[None]"]
+
+
+class PooledPublisher:
+    """Публикует через пул каналов пачками до *max_batch* сообщений."""
+
+    def __init__(
+        self,
+        channel_factory: Callable[[], Awaitable[PublishChannel]],
+        size: int = 4,
+        max_batch: int = 128,
+        linger: float = 0.0,
+        max_inflight: int = 8,
+    ) -> None:
+        """
+        size         – количество каналов (и воркеров);
+        max_batch    – максимум сообщений в одной пачке подтверждений;
+        linger       – сколько ждать добора пачки, если очередь опустела;
+        max_inflight – сколько неподтверждённых пачек держать на канал.
+        """
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self._factory = channel_factory
+        self._size = size
+        self._max_batch = max_batch
+        self._linger = linger
+        self._max_inflight = max_inflight
+        self._queue: Optional[asyncio.Queue[_Item]] = None
+        self._workers: List[asyncio.Task] = []
+        self._start_lock = asyncio.Lock()
+        self._stats: Dict[str, int] = {"published": 0, "failed": 0, "batches": 0}
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        batches = self._stats["batches"]
+        avg = (self._stats["published"] + self._stats["failed"]) / batches if batches else 0.0
+        return dict(self._stats, channels=len(self._workers), avg_batch=round(avg, 2))
+
+    async def start(self) -> None:
+        """Открыть каналы и запустить воркеры (повторный вызов безопасен)."""
+        async with self._start_lock:
+            if self._queue is not None:
+                return None
+            queue: asyncio.Queue[_Item] = asyncio.Queue()
+            channels = [await self._factory() for _ in range(self._size)]
+            self._workers = [asyncio.create_task(self._worker(queue, ch)) for ch in channels]
+            self._queue = queue
+            print(f"[🐇 PooledPublisher] Открыто каналов: {self._size}")
+        return None
+
+    async def publish(self, message: Any, routing_key: str) -> None:
+        """Поставить сообщение в конвейер и дождаться его подтверждения."""
+        if self._queue is None:
+            await self.start()
+        assert self._queue is not None
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((message, routing_key, fut))
+        await fut
+
+    async def close(self) -> None:
+        """Дождаться отправки очереди и остановить воркеры."""
+        if self._queue is None:
+            return None
+        await self._queue.join()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def _worker(self, queue: asyncio.Queue[_Item], channel: PublishChannel) -> None:
+        # Пачки конвейеризуются: следующая уходит, не дожидаясь confirms
+        # предыдущей; одновременно в полёте не больше max_inflight пачек.
+        inflight = asyncio.Semaphore(self._max_inflight)
+        while True:
+            batch = [await queue.get()]
+            # Делим накопившееся поровну между каналами, но не больше max_batch
+            limit = min(self._max_batch, max(1, -(-(queue.qsize() + 1) // self._size)))
+            while len(batch) < limit:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    if not self._linger:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), self._linger))
+                    except asyncio.TimeoutError:
+                        break
+            await inflight.acquire()
+            task = asyncio.create_task(self._confirm(queue, channel, batch))
+            task.add_done_callback(lambda _: inflight.release())
+            # Отдаём управление, чтобы остальные каналы тоже забирали пачки
+            await asyncio.sleep(0)
+
+    async def _confirm(self, queue: asyncio.Queue[_Item], channel: PublishChannel, batch: List[_Item]) -> None:
+        # Пачка уходит подряд, confirms ожидаются вместе
+        results = await asyncio.gather(
+            *(channel.publish(msg, key) for msg, key, _ in batch),
+            return_exceptions=True,
+        )
+        self._stats["batches"] += 1
+        for (_, _, fut), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                self._stats["failed"] += 1
+                if not fut.done():
+                    fut.set_exception(result)
+            else:
+                self._stats["published"] += 1
+                if not fut.done():
+                    fut.set_result(None)
+            queue.task_done()
+
+
+class _AioPikaChannel:
+    """PublishChannel поверх канала aio-pika с publisher confirms."""
+
+    __slots__ = ("_channel", "_message_cls")
+
+    def __init__(self, channel: Any, message_cls: Any) -> None:
+        self._channel = channel
+        self._message_cls = message_cls
+
+    async def publish(self, message: Any, routing_key: str) -> Any:
+        if isinstance(message, (bytes, bytearray)):
+            body, content_type = bytes(message), None
+        else:
+            body, content_type = json.dumps(message, ensure_ascii=False).encode(), "application/json"
+        return await self._channel.default_exchange.publish(
+            self._message_cls(body, content_type=content_type),
+            routing_key=routing_key,
+        )
+
+
+def rabbit_channel_factory(broker: Any) -> Callable[[], Awaitable[PublishChannel]]:
+    """Фабрика каналов на соединении FastStream `RabbitBroker`.
+
+    ``broker.connect()`` идемпотентен и возвращает уже установленное
+    соединение брокера, поэтому каналы пула открываются на том же
+    TCP-соединении, что и подписчики (например, приём RPC-ответов).
+    """
+
+    async def factory() -> PublishChannel:
+        import aio_pika  # type: ignore
+
+        connection = await broker.connect()
+        channel = await connection.channel(publisher_confirms=True)
+        return _AioPikaChannel(channel, aio_pika.Message)
+
+    return factory
@@ -8,6 +8,8 @@ from faststream.rabbit import RabbitBroker  # type: ignore
 
 from shared.schemas import TgResponse
 from tigro.contracts import ResponsePublisher
+from tigro.schemas import BroadcastFrame
+from tigro.transport.pool import PooledPublisher, rabbit_channel_factory
 
 
 class RabbitPublisher(ResponsePublisher):
@@ -18,11 +20,26 @@ class RabbitPublisher(ResponsePublisher):
     тот же интерфейс publish(user_id, response).
     """
 
-    def __init__(self, broker: RabbitBroker) -> None:
+    def __init__(self, broker: RabbitBroker, pool_size: int = 0, max_batch: int = 128) -> None:
+        """
+        pool_size > 0 – публиковать через пул каналов того же соединения
+        с пакетными publisher confirms (см. PooledPublisher).
+        """
         self._broker = broker
+        self._pool = (
+            PooledPublisher(rabbit_channel_factory(broker), size=pool_size, max_batch=max_batch)
+            if pool_size > 0
+            else None
+        )
+
+    async def _publish(self, message: dict, routing_key: str) -> None:
+        if self._pool is not None:
+            await self._pool.publish(message, routing_key)
+        else:
+            await self._broker.publish(message, routing_key=routing_key)
 
     async def publish(self, user_id: int, response: TgResponse) -> None:  # noqa: D401
-        await self._broker.publish(
+        await self._publish(
             response.dict(),
             # Отправляем все ответы в единую очередь, а сопоставление выполняем по correlation_id
             # Это упрощает настройку Gateway-бота и избавляет от необходимости динамически
@@ -33,3 +50,10 @@ class RabbitPublisher(ResponsePublisher):
         print(
             f"[🐇 RabbitPublisher] Ответ отправлен | user_id={user_id} | correlation_id={response.correlation_id}")
         return None
+
+    async def publish_broadcast(self, frame: BroadcastFrame) -> None:  # noqa: D401
+        await self._publish(
+            frame.model_dump(),
+            routing_key="event.broadcast",
+        )
+        return None
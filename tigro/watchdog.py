@@ -0,0 +1,332 @@
+"""
+Watchdog сервиса: зависания event loop, медленные хендлеры, профилирование.
+
+Когда растёт p99, важно понять, какой хендлер заблокировал loop::
+
+    watchdog = Watchdog(budget=0.5, stall_threshold=0.2)
+    router = Router(publisher=publisher, watchdog=watchdog)
+    watchdog.start()                       # внутри работающего loop
+    watchdog.install_signal()              # kill -USR1 <pid> → профиль 10 с
+
+• Зависание loop – отдельный поток следит за «пульсом», который loop
+  обновляет по таймеру. Если пульса нет дольше *stall_threshold*, поток
+  снимает стек loop-потока (это и есть блокирующий код) и список
+  выполняемых маршрутов.
+• Медленный хендлер – Router.dispatch оборачивает вызов в ``track``;
+  если хендлер не уложился в *budget*, сохраняется стек его задачи
+  (где он ждёт) и маршрут/матчер.
+• Профилирование – семплирующий профайлер снимает стек loop-потока во
+  время dispatch и отдаёт результат в folded-формате (flamegraph.pl,
+  speedscope, inferno).
+
+SRP  – модуль только наблюдает; на обработку событий не влияет.
+OCP  – отчёты можно отправлять куда угодно через *on_report*.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any, Callable, Deque, Dict, Iterator, List, Literal, Optional
+
+__all__ = ("Watchdog", "WatchdogReport", "SamplingProfiler")
+
+
+@dataclass
+class WatchdogReport:
+    """Зафиксированная проблема: зависание loop или медленный хендлер."""
+
+    kind: Literal["stall", "slow_handler"]
+    duration: float
+    stack: str
+    routes: List[str] = field(default_factory=list)
+    at: float = field(default_factory=time.time)
+
+    def format(self) -> str:
+        routes = ", ".join(self.routes) or "-"
+        return f"{self.kind} {self.duration * 1000:.0f}ms routes=[{routes}]\n{self.stack}"
+
+
+@dataclass
+class _Active:
+    route: str
+    started: float
+    task: Optional[asyncio.Task]
+    timer: Optional[asyncio.TimerHandle] = None
+    reported: bool = False
+
+
+def _fold(frame: Optional[FrameType]) -> List[str]:
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+def _task_stack(task: asyncio.Task) -> str:
+    """Стек приостановленной задачи по цепочке await (task.get_stack
+    для приостановленной корутины возвращает только внешний кадр)."""
+    frames: List[FrameType] = []
+    coro: Any = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    summary = traceback.StackSummary.extract((f, f.f_lineno) for f in frames)
+    return "".join(summary.format())
+
+
+class SamplingProfiler:
+    """Семплирующий профайлер одного потока (folded stacks)."""
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval: float = 0.005,
+        prefix: Optional[Callable[[], Optional[str]]] = None,
+    ) -> None:
+        """
+        prefix – функция, возвращающая корневой кадр стека (например,
+        текущий маршрут); None – семпл пропускается.
+        """
+        self._thread_id = thread_id
+        self._interval = interval
+        self._prefix = prefix
+        self._samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return None
+        self._samples.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="tigro-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Остановить и вернуть профиль в folded-формате."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.folded()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self._samples.most_common())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            root = self._prefix() if self._prefix is not None else ""
+            if root is None:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = _fold(frame)
+            if root:
+                stack.insert(0, root)
+            self._samples[";".join(stack)] += 1
+
+
+class Watchdog:
+    """Детектор зависаний loop и медленных хендлеров Router."""
+
+    def __init__(
+        self,
+        budget: float = 1.0,
+        stall_threshold: float = 0.2,
+        check_interval: float = 0.05,
+        on_report: Optional[Callable[[WatchdogReport], None]] = None,
+        history: int = 100,
+    ) -> None:
+        """
+        budget          – допустимая длительность хендлера, секунды;
+        stall_threshold – сколько loop может не отвечать;
+        on_report       – вызывается для каждого отчёта (из loop или из
+                          потока watchdog – функция должна быть потокобезопасной).
+        """
+        self._budget = budget
+        self._stall_threshold = stall_threshold
+        self._interval = check_interval
+        self._on_report = on_report
+        self.reports: Deque[WatchdogReport] = deque(maxlen=history)
+        self._active: Dict[int, _Active] = {}
+        self._seq = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._beat = time.monotonic()
+        self._beat_handle: Optional[asyncio.TimerHandle] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._profiler: Optional[SamplingProfiler] = None
+
+    # ------------------------------------------------------------------
+    # Жизненный цикл
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Запустить наблюдение за текущим event loop."""
+        if self._thread is not None:
+            return None
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._heartbeat()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="tigro-watchdog", daemon=True)
+        self._thread.start()
+        print(f"[🐕 Watchdog] Запущен: budget={self._budget}s, stall_threshold={self._stall_threshold}s")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._beat_handle is not None:
+            self._beat_handle.cancel()
+            self._beat_handle = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._profiler is not None:
+            self._profiler.stop()
+            self._profiler = None
+
+    # ------------------------------------------------------------------
+    # Медленные хендлеры
+    # ------------------------------------------------------------------
+    @contextlib.contextmanager
+    def track(self, route: str) -> Iterator[None]:
+        """Отметить выполнение маршрута *route* (вызывается Router.dispatch)."""
+        try:
+            task = asyncio.current_task()
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            task, loop = None, None
+        self._seq += 1
+        key = self._seq
+        active = _Active(route=route, started=time.monotonic(), task=task)
+        if loop is not None:
+            active.timer = loop.call_later(self._budget, self._on_budget, key)
+        self._active[key] = active
+        try:
+            yield None
+        finally:
+            self._active.pop(key, None)
+            if active.timer is not None:
+                active.timer.cancel()
+            elapsed = time.monotonic() - active.started
+            if elapsed > self._budget and not active.reported:
+                # Таймер не успел сработать: хендлер держал loop до конца
+                self._report(WatchdogReport("slow_handler", elapsed, "(completed, loop was blocked)", [route]))
+
+    def _on_budget(self, key: int) -> None:
+        active = self._active.get(key)
+        if active is None:
+            return None
+        active.reported = True
+        stack = _task_stack(active.task) if active.task is not None else ""
+        elapsed = time.monotonic() - active.started
+        self._report(WatchdogReport("slow_handler", elapsed, stack, [active.route]))
+
+    # ------------------------------------------------------------------
+    # Профилирование
+    # ------------------------------------------------------------------
+    def start_profiling(self, interval: float = 0.005) -> None:
+        """Начать семплирование loop-потока во время dispatch."""
+        if self._loop_thread is None:
+            raise RuntimeError("Watchdog is not started")
+        if self._profiler is not None and self._profiler.running:
+            return None
+        self._profiler = SamplingProfiler(self._loop_thread, interval, prefix=self._profile_root)
+        self._profiler.start()
+        print("[🔥 Watchdog] Профилирование запущено")
+
+    def stop_profiling(self) -> str:
+        """Остановить профилирование; результат – folded stacks."""
+        if self._profiler is None:
+            return ""
+        folded = self._profiler.stop()
+        self._profiler = None
+        print("[🔥 Watchdog] Профилирование остановлено")
+        return folded
+
+    async def profile(self, seconds: float, interval: float = 0.005) -> str:
+        """Профилировать *seconds* секунд и вернуть folded stacks."""
+        self.start_profiling(interval)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            folded = self.stop_profiling()
+        return folded
+
+    def install_signal(
+        self,
+        signum: int = getattr(signal, "SIGUSR1", signal.SIGINT),
+        seconds: float = 10.0,
+        directory: str = ".",
+    ) -> None:
+        """По сигналу профилировать *seconds* секунд и записать .folded файл."""
+        loop = self._loop or asyncio.get_running_loop()
+        loop.add_signal_handler(signum, lambda: loop.create_task(self._profile_to_file(seconds, directory)))
+
+    async def _profile_to_file(self, seconds: float, directory: str) -> None:
+        if self._profiler is not None:
+            return None
+        folded = await self.profile(seconds)
+        path = os.path.join(directory, f"tigro-profile-{os.getpid()}-{int(time.time())}.folded")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(folded)
+        print(f"[🔥 Watchdog] Профиль записан: {path}")
+
+    def _profile_root(self) -> Optional[str]:
+        active = list(self._active.values())
+        if not active:
+            return None
+        return f"dispatch:{active[-1].route}" if len(active) == 1 else "dispatch"
+
+    # ------------------------------------------------------------------
+    # Зависания loop
+    # ------------------------------------------------------------------
+    def _heartbeat(self) -> None:
+        self._beat = time.monotonic()
+        if self._loop is not None and not self._stop.is_set():
+            self._beat_handle = self._loop.call_later(self._interval, self._heartbeat)
+
+    def _watch(self) -> None:
+        stalled = False
+        while not self._stop.wait(self._interval):
+            age = time.monotonic() - self._beat
+            if age <= self._stall_threshold:
+                stalled = False
+                continue
+            if stalled or self._loop_thread is None:
+                continue
+            stalled = True
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            routes = [a.route for a in list(self._active.values())]
+            self._report(WatchdogReport("stall", age, stack, routes))
+
+    def _report(self, report: WatchdogReport) -> None:
+        self.reports.append(report)
+        print(f"[🐕 Watchdog] {report.format()}")
+        if self._on_report is not None:
+            try:
+                self._on_report(report)
+            except Exception as exc:  # noqa: BLE001
+                print(f"[⚠️ Watchdog] Ошибка on_report: {exc!r}")